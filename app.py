@@ -1,10 +1,12 @@
 import streamlit as st
-from utils import extract_text_from_pdf, clean_text, ats_score, extract_keywords, skill_match, grammar_readability_suggestions
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-import io
-import time
-import re
+from pdf_service import ExtractionService, PdfExtractionError
+from pipeline import prepare_resume, prepare_jd, score, STAGES as PIPELINE_STAGES
+from instrumentation import Tracer, span_dict, registry as metrics_registry
+from cache import AnalysisCache, analysis_key
+from deadline import Deadline, costs
+from highlight import highlight_keywords
+from reports import ReportWriter, candidate_from_result
+import os
 import random
 
 # -------------------------
@@ -31,19 +33,6 @@ def rewrite_bullet_point(bullet: str) -> str:
     core = core if core else "key project features"
     return random.choice(templates).format(core)
 
-def highlight_keywords(text, keywords):
-    def repl(match):
-        return (
-            "<mark style='background:linear-gradient(135deg,#22c55e,#3b82f6);"
-            "color:black;padding:2px 6px;border-radius:6px'>"
-            f"{match.group(0)}</mark>"
-        )
-
-    for kw in sorted(keywords, key=len, reverse=True):
-        pattern = re.compile(rf"\b{re.escape(kw)}\b", re.IGNORECASE)
-        text = pattern.sub(repl, text)
-    return text
-
 def generate_bullets_for_skill(skill: str):
     ideas = [
         f"Implemented {skill} in production environments to improve system reliability and scalability.",
@@ -61,31 +50,40 @@ def generate_learning_plan(skill: str):
         "Resume Tip": f"Add {skill} with a concrete project example in your resume."
     }
 
+STAGE_LABELS = {
+    "extract_text": "🔍 Extracting resume text...",
+    "tokenize_resume": "🧹 Cleaning text & preparing vectors...",
+    "sections": "📂 Finding resume sections...",
+    "readability": "🧠 Checking grammar & readability...",
+    "tokenize_jd": "📄 Preparing job description...",
+    "ats_score": "🤖 Running ATS scoring...",
+    "skill_match": "🧩 Matching skills...",
+    "section_scores": "📊 Scoring resume sections...",
+}
+
+# Per-analysis latency budget in seconds (unset or 0: no budget). Stages
+# that would overrun it fall back to cheaper versions; see pipeline.DEGRADED_MODES.
+LATENCY_BUDGET_S = float(os.environ.get("RESUME_ANALYZER_BUDGET_S") or 0)
+
+DEGRADED_LABELS = {
+    "readability": {"sentencizer": "readability (sentence length only)", "skipped": "readability (skipped)"},
+    "highlight": {"deferred": "highlighting (deferred)"},
+}
+
 # -------------------------
-# Step 6 helpers
+# Caching
 # -------------------------
-def section_score(section_text, jd_keywords):
-    section_text_clean = clean_text(section_text)
-    section_keywords = extract_keywords(section_text_clean)
-    if not jd_keywords:
-        return 0, "No job description keywords to compare."
-    match_count = len(section_keywords & jd_keywords)
-    percent = round((match_count / len(jd_keywords)) * 100, 2)
-    if percent >= 60:
-        feedback = "Strong alignment with job requirements."
-    elif percent >= 30:
-        feedback = "Moderate alignment. Consider adding more relevant keywords."
-    else:
-        feedback = "Low alignment. Add more relevant skills/projects matching the JD."
-    return percent, feedback
+@st.cache_resource
+def get_analysis_cache():
+    return AnalysisCache(max_entries=64, max_bytes=64 * 1024 * 1024)
 
-def extract_section(text, section_names):
-    text_lower = text.lower()
-    for name in section_names:
-        idx = text_lower.find(name)
-        if idx != -1:
-            return text[idx: idx + 800]
-    return ""
+@st.cache_resource
+def get_extraction_service():
+    return ExtractionService(workers=2, timeout=20.0, max_rss_mb=512)
+
+@st.cache_resource
+def prepare_role_templates(templates):
+    return {jd: prepare_jd(jd) for jd in templates}
 
 # -------------------------
 # Page + Theme
@@ -163,6 +161,9 @@ with colC:
     if st.button("🤖 ML Engineer"):
         st.session_state.job_desc = ml_engineer_jd
 
+# Pre-vectorized once per server process so switching templates is instant
+role_templates = prepare_role_templates((python_jd, data_analyst_jd, ml_engineer_jd))
+
 uploaded_file = st.file_uploader("Upload Resume (PDF)", type=["pdf"])
 job_desc = st.text_area("Paste Job Description", value=st.session_state.job_desc)
 
@@ -170,39 +171,91 @@ job_desc = st.text_area("Paste Job Description", value=st.session_state.job_desc
 # Analysis
 # -------------------------
 if uploaded_file and job_desc:
-    progress = st.progress(0)
-    status = st.empty()
-
-    status.info("🔍 Extracting resume text...")
-    resume_text = extract_text_from_pdf(uploaded_file)
-    progress.progress(25)
-    time.sleep(0.1)
-
-    status.info("🧹 Cleaning text & preparing vectors...")
-    resume_clean = clean_text(resume_text)
-    job_clean = clean_text(job_desc)
-    progress.progress(50)
-    time.sleep(0.1)
-
-    status.info("🤖 Running ATS scoring & NLP analysis...")
-    score = ats_score(resume_clean, job_clean)
-    resume_keywords = extract_keywords(resume_text)
-    jd_keywords = extract_keywords(job_desc)
-    missing = jd_keywords - resume_keywords
+    cache = get_analysis_cache()
+    pdf_bytes = uploaded_file.getvalue()
+
+    def run_analysis():
+        progress = st.progress(0)
+        status = st.empty()
+        stages = ("extract_text",) + PIPELINE_STAGES
+
+        def on_span(span):
+            done = stages.index(span.name) + 1
+            progress.progress(int(done / len(stages) * 100))
+            if done < len(stages):
+                status.info(STAGE_LABELS[stages[done]])
+
+        tracer = Tracer(on_span=on_span)
+        deadline = Deadline(LATENCY_BUDGET_S) if LATENCY_BUDGET_S else None
+
+        def build_resume():
+            status.info(STAGE_LABELS["extract_text"])
+            with tracer.span("extract_text", input_size=len(pdf_bytes)):
+                # Parsed in an isolated worker so a hostile PDF can only kill
+                # that worker, never stall the app for everyone else.
+                resume_text = cache.resume_text(pdf_bytes, get_extraction_service().extract_or_raise)
+            return prepare_resume(resume_text, tracer=tracer, deadline=deadline)
+
+        # Resume and JD sides are cached separately: editing the JD or
+        # switching role templates only re-runs the cheap scoring step.
+        resume = cache.resume_artifacts(pdf_bytes, build_resume)
+        jd = role_templates.get(job_desc) or cache.jd_artifacts(job_desc, lambda: prepare_jd(job_desc, tracer=tracer))
+        result = score(resume, jd, tracer=tracer)
+        # Highlighting only happens here in the UI, so only the app decides
+        # whether to defer it behind a toggle once the budget is spent
+        over_budget = deadline is not None and not deadline.allows(costs.estimate("highlight", len(resume.text) + len(jd.text)))
+        st.session_state.deferred_highlights = key if over_budget else None
+        status.success("✅ Analysis complete!")
+        st.session_state.last_spans = [span_dict(s) for s in tracer.spans]
+        return result
+
+    # Widget interactions rerun the whole script; only a new PDF or JD
+    # should pay for pdfplumber + spaCy again.
+    # Degraded results stay out of the shared cache but are held for this
+    # session, so widget reruns (e.g. revealing deferred highlights) don't
+    # re-run the analysis.
+    key = analysis_key(pdf_bytes, job_desc)
+    held = st.session_state.get("degraded_analysis")
+    try:
+        if held and held[0] == key:
+            analysis = held[1]
+        else:
+            analysis = cache.analysis(pdf_bytes, job_desc, run_analysis)
+            if analysis.degraded:
+                st.session_state.degraded_analysis = (key, analysis)
+    except PdfExtractionError as e:
+        st.error(f"Could not read this PDF: {e}")
+        st.stop()
+    with st.sidebar.expander("⏱ Stage timings"):
+        if st.session_state.get("last_spans"):
+            st.table(st.session_state.last_spans)
+        st.download_button(
+            label="Export metrics (Prometheus)",
+            data=metrics_registry.prometheus_text(),
+            file_name="metrics.prom",
+            mime="text/plain"
+        )
 
-    matched_skills, total_skills, skill_percent = skill_match(resume_text, job_desc)
-    grammar_tips = grammar_readability_suggestions(resume_text)
+    resume_text = analysis.resume_text
+    score = analysis.score
+    resume_keywords = analysis.resume_keywords
+    jd_keywords = analysis.jd_keywords
+    matched_skills = analysis.matched_skills
+    skill_percent = analysis.skill_percent
+    grammar_tips = analysis.grammar_tips
+    missing = analysis.missing
+    missing_skills = analysis.missing_skills
 
     # ATS Breakdown
-    total_jd_keywords = len(jd_keywords) if len(jd_keywords) > 0 else 1
-    matched_keyword_count = len(resume_keywords & jd_keywords)
-    keyword_overlap_percent = round((matched_keyword_count / total_jd_keywords) * 100, 2)
-    readability_percent = 80 if len(grammar_tips) <= 1 else 50
-
-    progress.progress(100)
-    status.success("✅ Analysis complete!")
+    keyword_overlap_percent = analysis.keyword_overlap_percent
+    readability_percent = analysis.readability_percent
 
+    highlights_deferred = st.session_state.get("deferred_highlights") == key
     st.success("Analysis Complete ✅")
+    degraded = dict(analysis.degraded, **({"highlight": "deferred"} if highlights_deferred else {}))
+    if degraded:
+        ran_degraded = ", ".join(DEGRADED_LABELS[stage][mode] for stage, mode in degraded.items())
+        st.warning(f"⏱ Latency budget reached. Ran in degraded mode: {ran_degraded}.")
 
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -215,7 +268,7 @@ if uploaded_file and job_desc:
         st.markdown('</div>', unsafe_allow_html=True)
     with col3:
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric("Missing Skills", len(missing))
+        st.metric("Missing Skills", len(missing_skills))
         st.markdown('</div>', unsafe_allow_html=True)
 
     st.progress(min(int(score), 100))
@@ -224,7 +277,10 @@ if uploaded_file and job_desc:
     st.subheader("📈 ATS Score Breakdown (Explainable AI)")
     st.write(f"🔑 Keyword Overlap Contribution: {keyword_overlap_percent}%")
     st.write(f"🧩 Skill Match Contribution: {skill_percent}%")
-    st.write(f"📖 Readability Contribution: {readability_percent}%")
+    if readability_percent is None:
+        st.write("📖 Readability Contribution: unknown (check skipped)")
+    else:
+        st.write(f"📖 Readability Contribution: {readability_percent}%")
     st.markdown('</div>', unsafe_allow_html=True)
 
     # Job Readiness Summary
@@ -241,8 +297,12 @@ if uploaded_file and job_desc:
     # Step 4: Highlighted Resume (ATS View)
     st.markdown('<div class="panel">', unsafe_allow_html=True)
     st.subheader("🔦 Highlighted Resume Preview (ATS View)")
-    highlighted_resume = highlight_keywords(resume_text, resume_keywords & jd_keywords)
-    st.markdown(f"<div style='line-height:1.7'>{highlighted_resume}</div>", unsafe_allow_html=True)
+    show_highlights = not highlights_deferred or st.toggle("Show highlighted matches", key="show_highlights")
+    if show_highlights:
+        highlighted_resume = highlight_keywords(resume_text, analysis.matched_keywords)
+        st.markdown(f"<div style='line-height:1.7'>{highlighted_resume}</div>", unsafe_allow_html=True)
+    else:
+        st.caption("Highlighting was deferred to stay within the latency budget.")
     st.markdown('</div>', unsafe_allow_html=True)
 
     # Missing Keywords
@@ -257,7 +317,7 @@ if uploaded_file and job_desc:
     # Step 5: AI Resume Coach
     st.markdown('<div class="panel">', unsafe_allow_html=True)
     st.subheader("🎯 AI Resume Coach – Add Missing Skills")
-    missing_list = sorted(list(missing))
+    missing_list = sorted(missing_skills)
     selected_skills = st.multiselect("Select skills you want resume bullets for:", missing_list[:12])
 
     if selected_skills:
@@ -273,13 +333,9 @@ if uploaded_file and job_desc:
     st.markdown('<div class="panel">', unsafe_allow_html=True)
     st.subheader("🧩 Resume Section Scores")
 
-    projects_text = extract_section(resume_text, ["projects", "project"])
-    skills_text = extract_section(resume_text, ["skills", "technical skills"])
-    experience_text = extract_section(resume_text, ["experience", "work experience", "professional experience"])
-
-    proj_score, proj_fb = section_score(projects_text, jd_keywords)
-    skills_score, skills_fb = section_score(skills_text, jd_keywords)
-    exp_score, exp_fb = section_score(experience_text, jd_keywords)
+    proj_score, proj_fb = analysis.section_scores["projects"]
+    skills_score, skills_fb = analysis.section_scores["skills"]
+    exp_score, exp_fb = analysis.section_scores["experience"]
 
     c1, c2, c3 = st.columns(3)
     with c1:
@@ -301,12 +357,12 @@ if uploaded_file and job_desc:
     left, right = st.columns(2)
     with left:
         st.markdown("**📄 Job Description (Highlighted Matches)**")
-        jd_highlighted = highlight_keywords(job_desc, resume_keywords & jd_keywords)
+        jd_highlighted = highlight_keywords(job_desc, analysis.matched_keywords) if show_highlights else job_desc
         st.markdown(f"<div style='line-height:1.7; max-height:300px; overflow:auto'>{jd_highlighted}</div>", unsafe_allow_html=True)
 
     with right:
         st.markdown("**📝 Resume (Highlighted Matches)**")
-        resume_highlighted = highlight_keywords(resume_text, resume_keywords & jd_keywords)
+        resume_highlighted = highlight_keywords(resume_text, analysis.matched_keywords) if show_highlights else resume_text
         st.markdown(f"<div style='line-height:1.7; max-height:300px; overflow:auto'>{resume_highlighted}</div>", unsafe_allow_html=True)
 
     st.caption("💡 Highlighted terms show overlap between your resume and the job description (ATS match).")
@@ -331,7 +387,7 @@ if uploaded_file and job_desc:
         checklist_items.append("Improve experience section with quantified achievements.")
     if len(missing) > 5:
         checklist_items.append("Add at least 5 missing keywords from the JD into your resume.")
-    if readability_percent < 70:
+    if readability_percent is not None and readability_percent < 70:
         checklist_items.append("Break long sentences and improve resume readability.")
 
     if "checklist_state" not in st.session_state:
@@ -352,8 +408,8 @@ if uploaded_file and job_desc:
     st.markdown('<div class="panel">', unsafe_allow_html=True)
     st.subheader("📚 Skill Gap Roadmap (Personalized Learning Plan)")
 
-    if missing:
-        for skill in list(missing)[:6]:
+    if missing_skills:
+        for skill in sorted(missing_skills)[:6]:
             plan = generate_learning_plan(skill)
             with st.expander(f"🚀 Learn {skill}"):
                 for k, v in plan.items():
@@ -366,6 +422,8 @@ if uploaded_file and job_desc:
     # Grammar
     st.markdown('<div class="panel">', unsafe_allow_html=True)
     st.subheader("🧠 Grammar & Readability Suggestions")
+    if readability_percent is None:
+        st.caption("The readability check was skipped to stay within the latency budget.")
     for tip in grammar_tips:
         st.info(tip)
     st.markdown('</div>', unsafe_allow_html=True)
@@ -391,27 +449,11 @@ if uploaded_file and job_desc:
 
     # PDF Download
     if st.button("Download Full AI Report (PDF)"):
-        buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        text = c.beginText(40, 750)
-        text.textLine(f"ATS Score: {score}%")
-        text.textLine(f"Skill Match: {skill_percent}%")
-        text.textLine(" ")
-        text.textLine("Missing Keywords:")
-        for word in list(missing)[:30]:
-            text.textLine(word)
-        text.textLine(" ")
-        text.textLine("AI Suggestions:")
-        for tip in grammar_tips:
-            text.textLine(f"- {tip}")
-        c.drawText(text)
-        c.showPage()
-        c.save()
-        buffer.seek(0)
+        report = ReportWriter().render(candidate_from_result(analysis, getattr(uploaded_file, "name", "")))
 
         st.download_button(
             label="Download Report",
-            data=buffer,
+            data=report,
             file_name="ai_resume_report.pdf",
             mime="application/pdf"
         )
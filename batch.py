@@ -0,0 +1,277 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+from utils import extract_text_from_pdf
+from dedup import DEFAULT_THRESHOLD, LSHIndex, minhash
+from models import warm_up
+from pdf_text import DEFAULT_MAX_PAGES, DEFAULT_MAX_CHARS
+from pipeline import prepare_resumes, prepare_jd, score
+from reports import export_archive, write_workbook
+
+RESULT_FIELDS = [
+    "rank", "file", "ats_score", "skill_percent", "keyword_overlap_percent",
+    "matched_count", "missing_count", "missing_skills", "readability_tips", "duplicate_of", "duplicates", "error",
+]
+
+# Resumes per analysis task: their readability parses share one nlp.pipe batch
+FILES_PER_TASK = 8
+# With dedup on, extractions submitted ahead per worker process
+EXTRACTIONS_PER_WORKER = 2
+
+# -------------------------
+# Worker side
+# -------------------------
+_jd = None
+_limits = {}
+
+
+def _init_worker(job_desc, limits=None):
+    # Runs once per worker process: the JD is prepared here instead of being
+    # shipped and re-tokenized with every task, and the spaCy pipeline is
+    # exercised once so the first real resume doesn't pay for lazy setup.
+    global _jd, _limits
+    _jd = prepare_jd(job_desc)
+    _limits = limits or {}
+    warm_up()
+
+
+def extract_resume_file(path):
+    # Text plus its MinHash, so near-duplicates are caught before any spaCy work
+    try:
+        text = extract_text_from_pdf(path, **_limits)
+    except Exception as e:
+        return path, None, None, f"{type(e).__name__}: {e}"
+    return path, text, minhash(text), ""
+
+
+def _result_row(path, result):
+    return {
+        "file": path,
+        "error": "",
+        "ats_score": result.score,
+        "skill_percent": result.skill_percent,
+        "keyword_overlap_percent": result.keyword_overlap_percent,
+        "matched_count": len(result.matched_skills),
+        "missing_count": len(result.missing_skills),
+        "matched_skills": sorted(result.matched_skills),
+        "missing_skills": sorted(result.missing_skills),
+        "missing_keywords": sorted(result.missing),
+        "readability_tips": result.grammar_tips,
+    }
+
+
+def analyze_resume_texts(items):
+    # items: [(path, text), ...] -> one row each, in order
+    resumes = prepare_resumes(text for _, text in items)
+    return [_result_row(path, score(resume, _jd)) for (path, _), resume in zip(items, resumes)]
+
+
+def analyze_resume_files(paths):
+    rows = {}
+    items = []
+    for path in paths:
+        path, text, _, error = extract_resume_file(path)
+        if error:
+            rows[path] = {"file": path, "error": error}
+        else:
+            items.append((path, text))
+    for row in analyze_resume_texts(items):
+        rows[row["file"]] = row
+    return [rows[path] for path in paths]
+
+# -------------------------
+# Driver side
+# -------------------------
+def find_pdfs(folder):
+    paths = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def iter_results(pdf_paths, job_desc, workers=None, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                 dedup_threshold=DEFAULT_THRESHOLD):
+    # Yields one result dict per resume in completion order (FILES_PER_TASK
+    # resumes per task), so callers can show progress (or persist partial
+    # output) while the pool is still busy.
+    # With dedup_threshold set, a resume whose MinHash Jaccard estimate
+    # against an earlier one reaches the threshold is not analyzed again: it
+    # gets a copy of that resume's result with duplicate_of pointing at it.
+    # "Earlier" means earlier in pdf_paths, whatever order extraction
+    # finishes in, so the same folder always keeps the same originals.
+    limits = {"max_pages": max_pages, "max_chars": max_chars}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(job_desc, limits)) as pool:
+        if not dedup_threshold:
+            futures = [
+                pool.submit(analyze_resume_files, pdf_paths[i:i + FILES_PER_TASK])
+                for i in range(0, len(pdf_paths), FILES_PER_TASK)
+            ]
+            for future in as_completed(futures):
+                yield from future.result()
+            return
+
+        lsh = LSHIndex(dedup_threshold)
+        finished = {}
+        waiting = {}
+        analyzing = set()
+        unique = []
+        pending = set()
+        # Extractions in flight plus those parked in the reorder buffer stay
+        # under `window`, so analysis tasks never queue behind the whole
+        # folder and only a bounded number of texts sit in driver memory
+        window = EXTRACTIONS_PER_WORKER * (workers or os.cpu_count() or 1)
+        order = {}
+        # Extractions are deduplicated in input order: early arrivals wait
+        # here until every path before them has been seen
+        extracted = {}
+        next_submit = next_index = 0
+
+        while True:
+            while next_submit < len(pdf_paths) and len(order) + len(extracted) < window:
+                future = pool.submit(extract_resume_file, pdf_paths[next_submit])
+                order[future] = next_submit
+                pending.add(future)
+                next_submit += 1
+            extracting = next_index < len(pdf_paths)
+
+            # Ship unique resumes in chunks; flush the remainder once
+            # extraction has finished
+            while len(unique) >= FILES_PER_TASK or (unique and not extracting):
+                analysis = pool.submit(analyze_resume_texts, unique[:FILES_PER_TASK])
+                del unique[:FILES_PER_TASK]
+                analyzing.add(analysis)
+                pending.add(analysis)
+
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in analyzing:
+                    analyzing.discard(future)
+                    for row in future.result():
+                        finished[row["file"]] = row
+                        yield row
+                        for path in waiting.pop(row["file"]):
+                            yield _duplicate_row(row, path)
+                else:
+                    extracted[order.pop(future)] = future.result()
+
+            while next_index in extracted:
+                path, text, signature, error = extracted.pop(next_index)
+                index, next_index = next_index, next_index + 1
+                if error:
+                    yield {"file": path, "error": error}
+                    continue
+                # Keyed by input index: equally similar originals resolve
+                # to the earliest one
+                found = lsh.find_duplicate(signature)
+                canonical = None if found is None else pdf_paths[found]
+                if canonical is None:
+                    lsh.add(index, signature)
+                    waiting[path] = []
+                    unique.append((path, text))
+                elif canonical in finished:
+                    yield _duplicate_row(finished[canonical], path)
+                else:
+                    waiting[canonical].append(path)
+
+
+def _duplicate_row(row, path):
+    return dict(row, file=path, duplicate_of=row["file"])
+
+
+def rank_results(rows, collapse_duplicates=True):
+    # Collapsed duplicates are listed on their original's row instead of
+    # taking up ranks of their own
+    if collapse_duplicates:
+        by_file = {r["file"]: r for r in rows}
+        for row in rows:
+            if row.get("duplicate_of"):
+                by_file[row["duplicate_of"]].setdefault("duplicates", []).append(row["file"])
+        rows = [r for r in rows if not r.get("duplicate_of")]
+    ok = [r for r in rows if not r.get("error")]
+    failed = [r for r in rows if r.get("error")]
+    ok.sort(key=lambda r: (r["ats_score"], r["skill_percent"]), reverse=True)
+    ranked = ok + failed
+    for i, row in enumerate(ranked, start=1):
+        row["rank"] = i if not row.get("error") else ""
+    return ranked
+
+
+def write_results(rows, out_path):
+    if out_path.lower().endswith(".xlsx"):
+        write_workbook(rows, out_path)
+        return
+    if out_path.lower().endswith(".jsonl"):
+        with open(out_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        return
+
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            row = dict(row)
+            row["readability_tips"] = " | ".join(row.get("readability_tips") or [])
+            row["missing_skills"] = " | ".join(row.get("missing_skills") or [])
+            row["duplicates"] = " | ".join(sorted(row.get("duplicates") or []))
+            writer.writerow(row)
+
+
+def rank_folder(folder, job_desc, out_path, workers=None, on_result=None, collapse_duplicates=True, **options):
+    pdf_paths = find_pdfs(folder)
+    rows = []
+    for row in iter_results(pdf_paths, job_desc, workers=workers, **options):
+        rows.append(row)
+        if on_result:
+            on_result(row, len(rows), len(pdf_paths))
+    ranked = rank_results(rows, collapse_duplicates=collapse_duplicates)
+    write_results(ranked, out_path)
+    return ranked
+
+# -------------------------
+# CLI
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a folder of resume PDFs against one job description.")
+    parser.add_argument("folder", help="Folder containing resume PDFs (searched recursively)")
+    parser.add_argument("--jd", required=True, help="Path to a text file with the job description")
+    parser.add_argument("--out", default="ranked.csv", help="Output file (.csv, .jsonl or .xlsx)")
+    parser.add_argument("--reports", help="Also write a .zip with the ranked workbook and one PDF report per candidate")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES, help="Pages to read per resume")
+    parser.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS, help="Characters to keep per resume")
+    parser.add_argument("--dedup-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated Jaccard similarity at which resumes count as duplicates (0 disables)")
+    parser.add_argument("--keep-duplicates", action="store_true", help="Rank duplicates individually instead of collapsing them")
+    args = parser.parse_args(argv)
+
+    with open(args.jd, encoding="utf-8") as f:
+        job_desc = f.read()
+
+    def report(row, done, total):
+        status = row["error"] or f"ATS {row['ats_score']}%"
+        if row.get("duplicate_of"):
+            status += f" (duplicate of {row['duplicate_of']})"
+        print(f"[{done}/{total}] {row['file']}: {status}", file=sys.stderr)
+
+    ranked = rank_folder(
+        args.folder, job_desc, args.out, workers=args.workers, on_result=report,
+        max_pages=args.max_pages, max_chars=args.max_chars,
+        dedup_threshold=args.dedup_threshold, collapse_duplicates=not args.keep_duplicates,
+    )
+    print(f"Wrote {len(ranked)} results to {args.out}", file=sys.stderr)
+    if args.reports:
+        count = export_archive(ranked, args.reports, workers=args.workers)
+        print(f"Wrote {count} reports to {args.reports}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import write_resume_pdf, resume_text, job_description  # noqa: E402
+from highlight import highlight_keywords, clear_cache as clear_highlight_cache  # noqa: E402
+from utils import (  # noqa: E402
+    extract_text_from_pdf, clean_text, extract_keywords, ats_score, skill_match,
+    grammar_readability_suggestions,
+)
+
+DEFAULT_PAGES = [1, 2, 5, 10, 20, 50]
+DEFAULT_JD_WORDS = [50, 200, 1000]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def measure(fn, repeat, input_chars):
+    fn()  # warm-up: lazy imports, model loads, regex compiles
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50 = percentile(timings, 50)
+    return {
+        "runs": repeat,
+        "input_chars": input_chars,
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "ops_per_s": round(1 / p50, 2) if p50 else None,
+        "chars_per_s": round(input_chars / p50) if p50 else None,
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def stage_cases(pdf_path, resume, jd):
+    # Each stage gets its own inputs prepared up front, so only that stage
+    # is inside the timed call.
+    resume_clean = clean_text(resume)
+    jd_clean = clean_text(jd)
+    matched = extract_keywords(resume) & extract_keywords(jd)
+    return {
+        "extract_text_from_pdf": (lambda: extract_text_from_pdf(pdf_path), os.path.getsize(pdf_path)),
+        "clean_text": (lambda: clean_text(resume), len(resume)),
+        "extract_keywords": (lambda: extract_keywords(resume), len(resume)),
+        "ats_score": (lambda: ats_score(resume_clean, jd_clean), len(resume_clean) + len(jd_clean)),
+        "skill_match": (lambda: skill_match(resume, jd), len(resume) + len(jd)),
+        "grammar_readability_suggestions": (lambda: grammar_readability_suggestions(resume), len(resume)),
+        # Output is memoized per (text, keywords); clear it so the scan itself is timed
+        "highlight_keywords": (lambda: (clear_highlight_cache(), highlight_keywords(resume, matched)), len(resume)),
+    }
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(pages_list, jd_words_list, repeat, stages=None):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in pages_list:
+            pdf_path = write_resume_pdf(os.path.join(tmp, f"resume_{pages}p.pdf"), pages, seed=pages)
+            resume = resume_text(pages, seed=pages)
+            for jd_words in jd_words_list:
+                jd = job_description(jd_words, seed=jd_words)
+                for stage, (fn, chars) in stage_cases(pdf_path, resume, jd).items():
+                    if stages and stage not in stages:
+                        continue
+                    # JD size doesn't affect resume-only stages; time them once per resume
+                    if jd_words != jd_words_list[0] and stage in ("extract_text_from_pdf", "clean_text",
+                                                                   "extract_keywords", "grammar_readability_suggestions"):
+                        continue
+                    stats = measure(fn, repeat, chars)
+                    row = {"stage": stage, "pages": pages, "jd_words": jd_words, **stats}
+                    results.append(row)
+                    print(f"{stage:<34} pages={pages:<3} jd={jd_words:<5} p50={stats['p50_ms']:>10.2f} ms  "
+                          f"p95={stats['p95_ms']:>10.2f} ms  peak={stats['peak_mem_kb']:>9.1f} KB", file=sys.stderr)
+    return results
+
+
+def compare(baseline_path, current_path):
+    # Prints p50 ratios (current / baseline) per stage+size; >1 is slower.
+    with open(baseline_path) as f:
+        baseline = {(r["stage"], r["pages"], r["jd_words"]): r for r in json.load(f)["results"]}
+    with open(current_path) as f:
+        current = json.load(f)["results"]
+    for row in current:
+        key = (row["stage"], row["pages"], row["jd_words"])
+        if key in baseline and baseline[key]["p50_ms"]:
+            ratio = row["p50_ms"] / baseline[key]["p50_ms"]
+            print(f"{row['stage']:<34} pages={row['pages']:<3} jd={row['jd_words']:<5} "
+                  f"{baseline[key]['p50_ms']:>10.2f} -> {row['p50_ms']:>10.2f} ms  x{ratio:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each utils stage on a synthetic resume/JD corpus.")
+    parser.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGES)
+    parser.add_argument("--jd-words", type=int, nargs="+", default=DEFAULT_JD_WORDS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stages", nargs="+", help="Only run these stages")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Compare two saved result files instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = run(args.pages, args.jd_words, args.repeat, stages=args.stages)
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} measurements to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
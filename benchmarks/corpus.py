@@ -0,0 +1,75 @@
+import random
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+SKILLS = [
+    "Python", "SQL", "Flask", "Django", "FastAPI", "Streamlit", "REST APIs", "Docker", "Kubernetes",
+    "AWS", "GCP", "Azure", "Git", "Linux", "Pandas", "NumPy", "scikit-learn", "TensorFlow", "PyTorch",
+    "NLP", "spaCy", "Tableau", "Power BI", "Excel", "Spark", "Airflow", "Kafka", "PostgreSQL", "MongoDB",
+    "Redis", "CI/CD", "Terraform", "JavaScript", "React", "statistics", "machine learning", "data visualization",
+]
+VERBS = ["Built", "Designed", "Implemented", "Led", "Optimized", "Automated", "Migrated", "Deployed", "Maintained"]
+OBJECTS = [
+    "a data pipeline", "an internal dashboard", "the billing service", "a recommendation model",
+    "the ETL jobs", "a REST API", "the reporting layer", "a feature store", "the search backend",
+]
+OUTCOMES = [
+    "reducing latency by {n}%", "saving {n} hours per week", "improving accuracy by {n}%",
+    "cutting cloud costs by {n}%", "supporting {n}k daily users",
+]
+FILLER = ["team", "stakeholders", "customers", "production", "quality", "delivery", "ownership", "mentoring"]
+HEADINGS = ["Summary", "Technical Skills", "Work Experience", "Projects", "Education", "Certifications"]
+
+LINES_PER_PAGE = 48
+
+
+def _bullet(rng):
+    skills = ", ".join(rng.sample(SKILLS, rng.randint(1, 3)))
+    sentence = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills}, {rng.choice(OUTCOMES).format(n=rng.randint(5, 80))}."
+    if rng.random() < 0.15:
+        # Long run-on sentence, to exercise the readability check
+        sentence = sentence[:-1] + " while working with " + " and ".join(rng.sample(FILLER, 4)) + " across several quarters to keep the roadmap on track and everyone aligned."
+    if rng.random() < 0.1:
+        sentence += f" The service was deployed by the {rng.choice(FILLER)} team."
+    return "- " + sentence
+
+
+def resume_lines(pages, seed=0):
+    rng = random.Random(seed)
+    lines = ["Jane Candidate", "jane@example.com | +1 555 0100"]
+    target = pages * LINES_PER_PAGE
+    while len(lines) < target:
+        lines.append(rng.choice(HEADINGS))
+        for _ in range(rng.randint(4, 10)):
+            lines.append(_bullet(rng))
+    return lines[:target]
+
+
+def resume_text(pages, seed=0):
+    return "\n".join(resume_lines(pages, seed))
+
+
+def write_resume_pdf(path, pages, seed=0):
+    c = canvas.Canvas(path, pagesize=letter)
+    lines = resume_lines(pages, seed)
+    for page_start in range(0, len(lines), LINES_PER_PAGE):
+        text = c.beginText(40, 750)
+        text.setFont("Helvetica", 9)
+        for line in lines[page_start:page_start + LINES_PER_PAGE]:
+            text.textLine(line[:120])
+        c.drawText(text)
+        c.showPage()
+    c.save()
+    return path
+
+
+def job_description(words, seed=0):
+    rng = random.Random(seed)
+    parts = ["We are looking for an engineer to join our team."]
+    count = len(parts[0].split())
+    while count < words:
+        sentence = f"Experience with {', '.join(rng.sample(SKILLS, 3))} and {rng.choice(FILLER)} is required."
+        parts.append(sentence)
+        count += len(sentence.split())
+    return " ".join(parts)
@@ -0,0 +1,43 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    # What every process pays just to `import utils` now
+    "import utils": "import utils",
+    # What the old eager module did at import time: spaCy model, sklearn, pdfplumber
+    "import utils + warm_up()": "import utils, models; models.warm_up()",
+}
+
+
+def time_scenario(code, runs):
+    timings = []
+    for _ in range(runs):
+        probe = (
+            "import time; _t = time.perf_counter(); "
+            f"{code}; "
+            "print(time.perf_counter() - _t)"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import cost of utils in fresh interpreters.")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for name, code in SCENARIOS.items():
+        timings = time_scenario(code, args.runs)
+        print(f"{name:<28} median {statistics.median(timings) * 1000:8.1f} ms   min {min(timings) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+
+# -------------------------
+# Keys
+# -------------------------
+def content_hash(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def analysis_key(pdf_bytes, job_desc):
+    return f"{content_hash(pdf_bytes)}:{content_hash(job_desc)}"
+
+
+def approx_size(value):
+    # Bytes held by a cached value: sys.getsizeof of every object reachable
+    # through containers and instance __dict__s, each object counted once.
+    # Token lists and keyword sets are mostly per-object overhead, so
+    # counting characters alone would undershoot several times over.
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+    return total
+
+
+def is_complete(value):
+    # Artifacts/results degraded to meet a latency budget are served once
+    # but never cached, so the next request gets a full analysis
+    return not getattr(value, "degraded", None)
+
+
+# -------------------------
+# Bounded LRU
+# -------------------------
+class LRUCache:
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key, value):
+        size = approx_size(value)
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._sizes.pop(key)
+                del self._data[key]
+            if size > self.max_bytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, _ = self._data.popitem(last=False)
+                self._bytes -= self._sizes.pop(old_key)
+
+    def get_or_compute(self, key, compute, cacheable=None):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if cacheable is None or cacheable(value):
+                self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+
+class AnalysisCache:
+    # Tiers keyed independently so each input only pays for its own side:
+    # extracted text and resume artifacts by PDF hash (a JD edit never
+    # re-runs pdfplumber or spaCy), JD artifacts by JD hash, and the cheap
+    # combined result by PDF + JD.
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024):
+        self.texts = LRUCache(max_entries=max_entries, max_bytes=max_bytes // 4)
+        self.resumes = LRUCache(max_entries=max_entries, max_bytes=max_bytes // 2)
+        self.jds = LRUCache(max_entries=max_entries, max_bytes=max_bytes // 8)
+        self.results = LRUCache(max_entries=max_entries, max_bytes=max_bytes // 8)
+
+    def resume_text(self, pdf_bytes, extract):
+        return self.texts.get_or_compute(content_hash(pdf_bytes), lambda: extract(pdf_bytes))
+
+    def resume_artifacts(self, pdf_bytes, compute):
+        return self.resumes.get_or_compute(content_hash(pdf_bytes), compute, cacheable=is_complete)
+
+    def jd_artifacts(self, job_desc, compute):
+        return self.jds.get_or_compute(content_hash(job_desc), compute)
+
+    def analysis(self, pdf_bytes, job_desc, compute):
+        return self.results.get_or_compute(analysis_key(pdf_bytes, job_desc), compute, cacheable=is_complete)
+
+    def clear(self):
+        self.texts.clear()
+        self.resumes.clear()
+        self.jds.clear()
+        self.results.clear()
@@ -0,0 +1,67 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds per input character before any timings have been observed. The
+# full spaCy parse runs at roughly 50k characters/s with en_core_web_sm on
+# one core; the sentencizer and the highlighter are an order of magnitude
+# cheaper.
+DEFAULT_COSTS = {
+    "readability": 2e-5,
+    "readability_sentencizer": 3e-6,
+    "highlight": 5e-7,
+}
+
+# Weight of the newest observation in the running per-character cost
+SMOOTHING = 0.2
+
+
+class Deadline:
+    # Latency budget for one request. Stored as an absolute wall-clock time
+    # so it survives being handed to a worker process.
+    def __init__(self, budget_s, at=None):
+        self.budget_s = budget_s
+        self.at = at if at is not None else time.time() + budget_s
+
+    @classmethod
+    def from_ms(cls, budget_ms):
+        return None if not budget_ms else cls(budget_ms / 1000)
+
+    def remaining(self):
+        return self.at - time.time()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def allows(self, seconds):
+        return self.remaining() >= seconds
+
+
+class StageCostModel:
+    # Per-process estimate of each stage's cost per input character,
+    # smoothed over the stage's recent runs, so degradation decisions track
+    # the hardware and load this process actually sees.
+    def __init__(self, defaults=DEFAULT_COSTS, smoothing=SMOOTHING):
+        self._rates = dict(defaults)
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+
+    def estimate(self, stage, input_size):
+        return self._rates.get(stage, 0.0) * max(input_size, 1)
+
+    def observe(self, stage, seconds, input_size):
+        if input_size <= 0:
+            return
+        rate = seconds / input_size
+        with self._lock:
+            old = self._rates.get(stage)
+            self._rates[stage] = rate if old is None else old + self.smoothing * (rate - old)
+
+    @contextmanager
+    def timed(self, stage, input_size):
+        start = time.perf_counter()
+        yield
+        self.observe(stage, time.perf_counter() - start, input_size)
+
+
+costs = StageCostModel()
@@ -0,0 +1,105 @@
+import zlib
+
+import numpy as np
+
+from utils import clean_text
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.9
+# Minimum chance that a pair exactly at the threshold is ever compared
+MIN_RECALL = 0.95
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(1)
+# Fixed seed: signatures are persisted (ResumeStore) and compared across processes
+_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_B = _rng.randint(0, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    # Hashed word k-shingles of clean_text(text); stable across processes
+    # (crc32, not the randomized built-in hash)
+    tokens = clean_text(text).split()
+    if not tokens:
+        return np.zeros(0, dtype=np.uint64)
+    if len(tokens) < k:
+        grams = [" ".join(tokens)]
+    else:
+        grams = [" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams)))
+
+
+def minhash(text, k=SHINGLE_SIZE):
+    # NUM_PERM uint32 values; None for texts without tokens (never duplicates)
+    values = shingles(text, k)
+    if not len(values):
+        return None
+    hashed = (_A[:, None] * values[None, :] + _B[:, None]) % _PRIME
+    return (hashed & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+
+def jaccard(sig_a, sig_b):
+    # Estimated Jaccard similarity of the underlying shingle sets
+    return float(np.mean(sig_a == sig_b))
+
+
+def candidate_probability(similarity, bands, rows):
+    # Chance that a pair with this Jaccard similarity shares a band bucket
+    return 1 - (1 - similarity ** rows) ** bands
+
+
+def lsh_params(threshold, num_perm=NUM_PERM, recall=MIN_RECALL):
+    # (bands, rows) with bands * rows <= num_perm that still make a pair at
+    # the threshold a candidate with probability >= recall. The S-curve
+    # midpoint then sits below the threshold; among those settings the one
+    # with the most rows per band lets through the fewest dissimilar pairs.
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if candidate_probability(threshold, bands, rows) >= recall:
+            return bands, rows
+    return num_perm, 1
+
+
+class LSHIndex:
+    # Banded MinHash index: a query only compares against keys sharing at
+    # least one band bucket, then confirms with the signature estimate.
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(threshold)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = {}
+
+    def _band_keys(self, signature):
+        r = self.rows
+        return [signature[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def add(self, key, signature):
+        if signature is None:
+            return
+        self._signatures[key] = signature
+        for bucket, band in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(band, []).append(key)
+
+    def query(self, signature):
+        # [(key, similarity), ...] at or above the threshold, most similar first
+        if signature is None:
+            return []
+        seen = set()
+        for bucket, band in zip(self._buckets, self._band_keys(signature)):
+            seen.update(bucket.get(band, ()))
+        matches = [(key, jaccard(signature, self._signatures[key])) for key in seen]
+        matches = [m for m in matches if m[1] >= self.threshold]
+        matches.sort(key=lambda m: (-m[1], m[0]))
+        return matches
+
+    def find_duplicate(self, signature):
+        matches = self.query(signature)
+        return matches[0][0] if matches else None
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, key):
+        return key in self._signatures
@@ -0,0 +1,68 @@
+import re
+from functools import lru_cache
+
+from deadline import costs
+
+MARK_OPEN = (
+    "<mark style='background:linear-gradient(135deg,#22c55e,#3b82f6);"
+    "color:black;padding:2px 6px;border-radius:6px'>"
+)
+MARK_CLOSE = "</mark>"
+
+_WORD = re.compile(r"\w+")
+_SINGLE_WORD = re.compile(r"\w+\Z")
+
+
+@lru_cache(maxsize=64)
+def compile_keywords(keywords):
+    # keywords: frozenset of lowercase terms. Plain words (everything
+    # extract_keywords produces) are found by one \w+ scan with O(1) set
+    # lookups; anything else falls back to a single combined alternation,
+    # longest first so multi-word terms win over their prefixes.
+    lowered = frozenset(k.lower() for k in keywords if k)
+    if not lowered:
+        return None
+    if all(_SINGLE_WORD.match(k) for k in lowered):
+        return _WORD, lowered
+    alternation = "|".join(re.escape(k) for k in sorted(lowered, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE), None
+
+
+@lru_cache(maxsize=128)
+def _highlight(text, keywords):
+    # Timed here, behind the cache, so the "highlight" cost the app budgets
+    # for only learns from real passes
+    with costs.timed("highlight", len(text)):
+        return _mark(text, keywords)
+
+
+def _mark(text, keywords):
+    compiled = compile_keywords(keywords)
+    if compiled is None:
+        return text
+    pattern, words = compiled
+
+    # One left-to-right pass over the original text, so markup inserted for
+    # one match can never be matched again by a later keyword.
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        if words is not None and match.group(0).lower() not in words:
+            continue
+        start, end = match.span()
+        parts.append(text[last:start])
+        parts.append(MARK_OPEN)
+        parts.append(match.group(0))
+        parts.append(MARK_CLOSE)
+        last = end
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def highlight_keywords(text, keywords):
+    return _highlight(text, frozenset(keywords))
+
+
+def clear_cache():
+    _highlight.cache_clear()
+    compile_keywords.cache_clear()
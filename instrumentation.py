@@ -0,0 +1,127 @@
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+logger = logging.getLogger("resume_analyzer.metrics")
+
+Span = namedtuple("Span", ["name", "wall_s", "cpu_s", "input_size", "ok"])
+
+# Seconds; wide enough to cover a regex pass and a 50-page pdfplumber run
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+# -------------------------
+# Process-wide registry
+# -------------------------
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def observe(self, span):
+        with self._lock:
+            stage = self._stages.get(span.name)
+            if stage is None:
+                stage = self._stages[span.name] = {
+                    "count": 0, "errors": 0, "wall_sum": 0.0, "cpu_sum": 0.0, "input_sum": 0,
+                    "buckets": [0] * len(BUCKETS),
+                }
+            stage["count"] += 1
+            stage["errors"] += 0 if span.ok else 1
+            stage["wall_sum"] += span.wall_s
+            stage["cpu_sum"] += span.cpu_s
+            stage["input_sum"] += span.input_size or 0
+            for i, bound in enumerate(BUCKETS):
+                if span.wall_s <= bound:
+                    stage["buckets"][i] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(stage, buckets=list(stage["buckets"])) for name, stage in self._stages.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP resume_stage_seconds Wall time per analysis stage.",
+            "# TYPE resume_stage_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        for name, stage in sorted(snapshot.items()):
+            for bound, count in zip(BUCKETS, stage["buckets"]):
+                lines.append(f'resume_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'resume_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {stage["count"]}')
+            lines.append(f'resume_stage_seconds_sum{{stage="{name}"}} {stage["wall_sum"]:.6f}')
+            lines.append(f'resume_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+        for metric, key, help_text in (
+            ("resume_stage_cpu_seconds_total", "cpu_sum", "CPU time per analysis stage."),
+            ("resume_stage_input_size_total", "input_sum", "Input size (bytes or characters) per analysis stage."),
+            ("resume_stage_errors_total", "errors", "Stages that raised."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, stage in sorted(snapshot.items()):
+                value = stage[key]
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f'{metric}{{stage="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# -------------------------
+# Per-request tracer
+# -------------------------
+class Tracer:
+    # Collects the spans of one request. Every span is also added to the
+    # process-wide registry and logged as a JSON line at DEBUG level.
+    # on_span(span) fires as each stage finishes, e.g. to drive a progress bar.
+    def __init__(self, on_span=None, registry=registry):
+        self.spans = []
+        self.on_span = on_span
+        self.registry = registry
+
+    @contextmanager
+    def span(self, name, input_size=None):
+        wall_start = time.perf_counter()
+        # Per-thread CPU: Streamlit sessions and server threads share the
+        # process, so process_time() would bill other requests to this span
+        cpu_start = time.thread_time()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            span = Span(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start, input_size, ok)
+            self.spans.append(span)
+            if self.registry is not None:
+                self.registry.observe(span)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(json.dumps(span_dict(span)))
+            if self.on_span and ok:
+                self.on_span(span)
+
+    @property
+    def total_wall_s(self):
+        return sum(s.wall_s for s in self.spans)
+
+    def json_lines(self):
+        return "\n".join(json.dumps(span_dict(s)) for s in self.spans)
+
+
+def span_dict(span):
+    return {
+        "stage": span.name,
+        "wall_ms": round(span.wall_s * 1000, 3),
+        "cpu_ms": round(span.cpu_s * 1000, 3),
+        "input_size": span.input_size,
+        "ok": span.ok,
+    }
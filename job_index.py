@@ -0,0 +1,106 @@
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from utils import clean_text, extract_keywords, term_counts, vector_norm
+
+
+class JobIndex:
+    # Fits the JD vocabulary once and scores any number of resumes against
+    # it with one sparse product. Scores match ats_score(clean_text(resume),
+    # clean_text(jd)) exactly: only JD terms contribute to the dot product, so
+    # resumes are projected onto the JD vocabulary and their full-vocabulary
+    # norms are kept alongside.
+    def __init__(self, job_desc, vocabulary=None, n_features=None):
+        # vocabulary/n_features: score in an existing term space instead of
+        # fitting one (e.g. a ResumeStore's columns). Only JD terms need to be
+        # in the mapping; JD terms absent from it can't match anything but
+        # still count towards the JD norm.
+        self.job_desc = job_desc
+        self.job_clean = clean_text(job_desc)
+        self.jd_keywords = extract_keywords(self.job_clean)
+
+        if vocabulary is not None:
+            self.vocabulary = vocabulary
+            n_features = len(vocabulary) if n_features is None else n_features
+            counts = term_counts(self.job_clean.split())
+            self.jd_vec = np.zeros(n_features, dtype=np.float64)
+            for term, count in counts.items():
+                col = vocabulary.get(term)
+                if col is not None:
+                    self.jd_vec[col] = count
+            self.jd_norm = vector_norm(counts)
+        else:
+            vectorizer = CountVectorizer()
+            try:
+                jd_row = vectorizer.fit_transform([self.job_clean])
+                self.vocabulary = vectorizer.vocabulary_
+            except ValueError:
+                # Empty JD (or only one-letter tokens): nothing to match against
+                jd_row = sparse.csr_matrix((1, 0), dtype=np.float64)
+                self.vocabulary = {}
+            self.jd_vec = np.asarray(jd_row.toarray()[0], dtype=np.float64)
+            self.jd_norm = float(np.sqrt(self.jd_vec @ self.jd_vec))
+
+        self.keyword_mask = np.zeros(len(self.jd_vec), dtype=np.float64)
+        for word in self.jd_keywords:
+            col = self.vocabulary.get(word)
+            if col is not None:
+                self.keyword_mask[col] = 1.0
+
+    def vectorize(self, resume_texts):
+        # Returns (X, norms): X is an (N x |JD vocab|) CSR count matrix and
+        # norms holds each resume's L2 norm over its *full* vocabulary.
+        indptr = [0]
+        indices = []
+        data = []
+        norms = []
+        vocab = self.vocabulary
+        for text in resume_texts:
+            # Same tokens CountVectorizer would produce on cleaned text
+            counts = Counter(t for t in clean_text(text).split() if len(t) > 1)
+            sq = 0
+            for term, count in counts.items():
+                sq += count * count
+                col = vocab.get(term)
+                if col is not None:
+                    indices.append(col)
+                    data.append(count)
+            indptr.append(len(indices))
+            norms.append(sq ** 0.5)
+
+        X = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(norms), len(vocab)),
+        )
+        return X, np.asarray(norms, dtype=np.float64)
+
+    def score_matrix(self, X, norms):
+        dots = X @ self.jd_vec
+        denom = norms * self.jd_norm
+        cosine = np.divide(dots, denom, out=np.zeros_like(dots), where=denom != 0)
+        semantic_score = cosine * 100
+
+        total_required = len(self.jd_keywords) if len(self.jd_keywords) > 0 else 1
+        # Shares X's index arrays, so a memory-mapped X isn't copied
+        present = sparse.csr_matrix((np.ones(len(X.data), dtype=np.float64), X.indices, X.indptr), shape=X.shape)
+        keyword_overlap = (present @ self.keyword_mask) / total_required * 100
+
+        final_score = 0.5 * semantic_score + 0.3 * keyword_overlap + 0.2 * 80
+        return np.round(np.minimum(final_score, 100), 2)
+
+    def score(self, resume_texts):
+        X, norms = self.vectorize(resume_texts)
+        return self.score_matrix(X, norms)
+
+    def score_one(self, resume_text):
+        return float(self.score([resume_text])[0])
+
+    def rank(self, resume_texts, top_k=None):
+        scores = self.score(resume_texts)
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        return [(int(i), float(scores[i])) for i in order]
@@ -0,0 +1,68 @@
+import threading
+
+SPACY_MODEL = "en_core_web_sm"
+
+_lock = threading.Lock()
+_pipelines = {}
+
+
+# -------------------------
+# spaCy (loaded on first use)
+# -------------------------
+def _load_nlp(exclude):
+    import spacy
+
+    try:
+        return spacy.load(SPACY_MODEL, exclude=list(exclude))
+    except Exception:
+        # Model not installed (e.g. cloud build without the wheel): fall back
+        # to a blank pipeline that can still split sentences. Never download
+        # anything from here.
+        return _blank_sentencizer()
+
+
+def _blank_sentencizer():
+    import spacy
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def get_nlp(exclude=()):
+    # One shared pipeline per set of excluded components; callers that only
+    # need a subset (e.g. the parser) ask for a slimmer copy.
+    key = tuple(sorted(exclude))
+    nlp = _pipelines.get(key)
+    if nlp is None:
+        with _lock:
+            nlp = _pipelines.get(key)
+            if nlp is None:
+                nlp = _pipelines[key] = _load_nlp(key)
+    return nlp
+
+
+def get_sentencizer():
+    # Rule-based sentence splitting only: no model, no parser. Used when a
+    # request's latency budget can't afford the full pipeline.
+    nlp = _pipelines.get("sentencizer")
+    if nlp is None:
+        with _lock:
+            nlp = _pipelines.get("sentencizer")
+            if nlp is None:
+                nlp = _pipelines["sentencizer"] = _blank_sentencizer()
+    return nlp
+
+
+# -------------------------
+# Warm-up hook
+# -------------------------
+def warm_up():
+    # Pays every lazy cost up front: call from process-pool initializers or
+    # at service start so the first real request isn't the slow one.
+    import pdfplumber  # noqa: F401
+    from sklearn.feature_extraction.text import CountVectorizer  # noqa: F401
+
+    from readability import get_analyzer
+
+    get_analyzer().suggest("Warm up the language pipeline.")
@@ -0,0 +1,208 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+from pdf_text import extract_text, DEFAULT_MAX_PAGES, DEFAULT_MAX_CHARS
+
+POLL_INTERVAL = 0.05
+
+
+@dataclass
+class ExtractionResult:
+    text: str = ""
+    error: str = ""
+    # "", "invalid_pdf", "timeout", "memory", "crashed", "busy"
+    error_type: str = ""
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.error_type
+
+
+class PdfExtractionError(Exception):
+    def __init__(self, result):
+        super().__init__(result.error)
+        self.result = result
+
+
+# -------------------------
+# Worker process
+# -------------------------
+def _worker_main(conn, max_pages, max_chars):
+    while True:
+        try:
+            pdf_bytes = conn.recv()
+        except EOFError:
+            return
+        if pdf_bytes is None:
+            return
+        try:
+            text = extract_text(pdf_bytes, max_pages=max_pages, max_chars=max_chars)
+            conn.send(("ok", text))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+def _rss_bytes(pid):
+    # Linux only; elsewhere only the deadline is enforced.
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class _Worker:
+    def __init__(self, ctx, max_pages, max_chars):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, max_pages, max_chars), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+
+# -------------------------
+# Service
+# -------------------------
+class ExtractionService:
+    # Runs pdfplumber in a pool of recyclable subprocesses. Each job gets a
+    # wall-clock deadline and an RSS ceiling; a worker that blows either (or
+    # dies) is killed and replaced, and the caller gets a structured error
+    # instead of a stalled server. Callers that can't get a worker within
+    # acquire_timeout get a "busy" error rather than queueing forever.
+    def __init__(self, workers=2, timeout=20.0, max_rss_mb=512, max_jobs_per_worker=100,
+                 max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS, start_method="spawn",
+                 acquire_timeout=None):
+        self.timeout = timeout
+        # How long a caller waits for a free worker before getting "busy"
+        self.acquire_timeout = timeout if acquire_timeout is None else acquire_timeout
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        # spawn by default: forking a threaded host (Streamlit, asyncio
+        # servers) can copy held locks into the child.
+        self._ctx = multiprocessing.get_context(start_method)
+        self._idle = queue.Queue()
+        self._all = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(workers):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        worker = _Worker(self._ctx, self.max_pages, self.max_chars)
+        with self._lock:
+            self._all.add(worker)
+        return worker
+
+    def _retire(self, worker, kill=True):
+        with self._lock:
+            self._all.discard(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+
+    def _release(self, worker):
+        if self._closed:
+            self._retire(worker)
+        else:
+            self._idle.put(worker)
+
+    def extract(self, pdf_bytes):
+        if self._closed:
+            raise RuntimeError("ExtractionService is closed")
+        start = time.perf_counter()
+        try:
+            worker = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            return self._result(start, "busy", f"No PDF worker free within {self.acquire_timeout:g}s")
+
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        replied = False
+        try:
+            worker.conn.send(pdf_bytes)
+            while not worker.conn.poll(POLL_INTERVAL):
+                if time.perf_counter() > deadline:
+                    return self._result(start, "timeout", f"PDF parsing exceeded {self.timeout:g}s")
+                if self.max_rss and _rss_bytes(worker.process.pid) > self.max_rss:
+                    return self._result(start, "memory", f"PDF parsing exceeded {self.max_rss // (1024 * 1024)} MB")
+                if not worker.process.is_alive():
+                    return self._result(start, "crashed", "PDF worker exited unexpectedly")
+            status, payload = worker.conn.recv()
+            replied = True
+        except (EOFError, OSError, BrokenPipeError):
+            return self._result(start, "crashed", "PDF worker exited unexpectedly")
+        finally:
+            # Whatever went wrong (including errors not caught above), a
+            # worker without a clean reply is replaced, never leaked
+            if replied:
+                self._recycle(worker)
+            else:
+                self._replace(worker)
+
+        if status == "ok":
+            return ExtractionResult(text=payload, seconds=time.perf_counter() - start)
+        return self._result(start, "invalid_pdf", payload)
+
+    def _recycle(self, worker):
+        worker.jobs += 1
+        if worker.jobs >= self.max_jobs_per_worker:
+            # Recycle long-lived workers so fragmentation/leaks can't build up
+            self._retire(worker, kill=False)
+            worker = self._spawn()
+        self._release(worker)
+
+    def _replace(self, worker):
+        self._retire(worker)
+        if not self._closed:
+            self._release(self._spawn())
+
+    @staticmethod
+    def _result(start, error_type, message):
+        return ExtractionResult(error=message, error_type=error_type, seconds=time.perf_counter() - start)
+
+    def extract_or_raise(self, pdf_bytes):
+        result = self.extract(pdf_bytes)
+        if not result.ok:
+            raise PdfExtractionError(result)
+        return result.text
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(worker, kill=False)
+        with self._lock:
+            remaining = list(self._all)
+        for worker in remaining:
+            self._retire(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,107 @@
+import io
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+PageText = namedtuple("PageText", ["number", "text", "seconds"])
+
+# Sensible caps for resumes; anything past this is almost certainly a scan
+# dump or an adversarial upload and isn't worth a worker's time.
+DEFAULT_MAX_PAGES = 20
+DEFAULT_MAX_CHARS = 100_000
+PAGES_PER_TASK = 4
+
+
+def _open(source):
+    import pdfplumber
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return pdfplumber.open(source)
+
+
+def _extract_page(page):
+    start = time.perf_counter()
+    text = page.extract_text() or ""
+    elapsed = time.perf_counter() - start
+    # Drop pdfminer's per-page layout objects right away so memory stays
+    # flat on long documents.
+    page.close()
+    return text, elapsed
+
+
+def _extract_range(source, first, last):
+    # Worker task for parallel extraction: each process opens its own
+    # handle, since pdfplumber documents can't be shared across processes.
+    out = []
+    with _open(source) as pdf:
+        for i in range(first, last):
+            text, elapsed = _extract_page(pdf.pages[i])
+            out.append(PageText(i + 1, text, elapsed))
+    return out
+
+
+def _as_source(pdf_file):
+    # Paths can be reopened by workers as-is; file-likes are read once.
+    if isinstance(pdf_file, (str, os.PathLike, bytes, bytearray)):
+        return pdf_file
+    if hasattr(pdf_file, "seek"):
+        pdf_file.seek(0)
+    return pdf_file.read()
+
+
+def _serial_pages(pdf_file, max_pages):
+    with _open(pdf_file) as pdf:
+        pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
+        for i, page in enumerate(pages):
+            text, elapsed = _extract_page(page)
+            yield PageText(i + 1, text, elapsed)
+
+
+def _parallel_pages(pdf_file, max_pages, workers):
+    source = _as_source(pdf_file)
+    with _open(source) as pdf:
+        page_count = len(pdf.pages)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+
+    ranges = [(first, min(first + PAGES_PER_TASK, page_count)) for first in range(0, page_count, PAGES_PER_TASK)]
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(_extract_range, source, first, last) for first, last in ranges]
+        # Yield in page order as soon as the next chunk is ready.
+        for future in futures:
+            yield from future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pdf_pages(pdf_file, max_pages=None, max_chars=None, workers=1):
+    # Yields PageText(number, text, seconds) page by page so consumers can
+    # start work before the whole PDF is parsed. Stops after max_pages pages
+    # or once max_chars characters have been produced (the last page is
+    # truncated to fit).
+    if workers and workers > 1:
+        pages = _parallel_pages(pdf_file, max_pages, workers)
+    else:
+        pages = _serial_pages(pdf_file, max_pages)
+
+    produced = 0
+    try:
+        for page in pages:
+            if max_chars is not None and produced + len(page.text) >= max_chars:
+                yield page._replace(text=page.text[:max_chars - produced])
+                return
+            produced += len(page.text)
+            yield page
+    finally:
+        pages.close()
+
+
+def extract_text(pdf_file, max_pages=None, max_chars=None, workers=1):
+    return "".join(
+        page.text + " "
+        for page in iter_pdf_pages(pdf_file, max_pages=max_pages, max_chars=max_chars, workers=workers)
+        if page.text
+    )
@@ -0,0 +1,250 @@
+from dataclasses import dataclass, field
+
+from utils import (
+    clean_text, tokenize_with_offsets, keywords_from_tokens, term_counts, vector_norm,
+    ats_score_from_counts, skill_match, section_score, grammar_readability_suggestions,
+    grammar_readability_suggestions_many,
+)
+from sections import segment_sections, section_tokens
+from instrumentation import Tracer
+from skills import get_skill_matcher
+from readability import get_sentencizer_analyzer
+from deadline import costs
+
+# Spans emitted by analyze(), in order
+RESUME_STAGES = ("tokenize_resume", "sections", "readability")
+JD_STAGES = ("tokenize_jd",)
+SCORE_STAGES = ("ats_score", "skill_match", "section_scores")
+STAGES = RESUME_STAGES + JD_STAGES + SCORE_STAGES
+
+# Always scored (and shown in the app) even when the heading is missing
+SCORED_SECTIONS = ("projects", "skills", "experience")
+
+# What a stage falls back to when the request's Deadline can't afford it;
+# results list the stages that did in AnalysisResult.degraded
+DEGRADED_MODES = {
+    "readability": ("sentencizer", "skipped"),
+}
+
+
+@dataclass
+class AnalysisResult:
+    resume_text: str
+    jd_text: str
+    resume_clean: str
+    jd_clean: str
+    resume_tokens: list
+    jd_tokens: list
+    resume_keywords: set
+    jd_keywords: set
+    matched_keywords: set
+    missing: set
+    score: float
+    matched_skills: set
+    # Required skills (skill_match's denominator) the resume lacks; missing
+    # holds every absent JD keyword, filler words included
+    missing_skills: set
+    skill_percent: float
+    keyword_overlap_percent: float
+    sections: dict = field(default_factory=dict)
+    section_scores: dict = field(default_factory=dict)
+    grammar_tips: list = field(default_factory=list)
+    degraded: dict = field(default_factory=dict)
+
+    @property
+    def readability_percent(self):
+        # None when the check was skipped: no tips doesn't mean readable
+        if self.degraded.get("readability") == "skipped":
+            return None
+        return 80 if len(self.grammar_tips) <= 1 else 50
+
+    def summary(self):
+        # JSON-friendly view without the raw text/token payloads
+        return {
+            "ats_score": float(self.score),
+            "skill_percent": self.skill_percent,
+            "keyword_overlap_percent": self.keyword_overlap_percent,
+            "readability_percent": self.readability_percent,
+            "matched_skills": sorted(self.matched_skills),
+            "missing_skills": sorted(self.missing_skills),
+            "missing_keywords": sorted(self.missing),
+            "section_scores": {
+                name: {"percent": percent, "feedback": feedback}
+                for name, (percent, feedback) in self.section_scores.items()
+            },
+            "grammar_tips": list(self.grammar_tips),
+            "degraded": dict(self.degraded),
+        }
+
+
+@dataclass
+class ResumeArtifacts:
+    # Everything about a resume that doesn't depend on the JD
+    text: str
+    clean: str
+    tokens: list
+    token_starts: list
+    term_counts: dict
+    norm: float
+    keywords: set
+    skills: set
+    sections: dict
+    section_keywords: dict
+    grammar_tips: list
+    degraded: dict = field(default_factory=dict)
+
+
+@dataclass
+class JDArtifacts:
+    text: str
+    clean: str
+    tokens: list
+    term_counts: dict
+    norm: float
+    keywords: set
+    skills: set
+
+
+def _readability(text, deadline):
+    # Full parse when the remaining budget affords it, else the
+    # sentencizer-only check, else nothing. Returns (tips, degraded mode).
+    size = len(text)
+    if deadline is None or deadline.allows(costs.estimate("readability", size)):
+        with costs.timed("readability", size):
+            return grammar_readability_suggestions(text), None
+    if deadline.allows(costs.estimate("readability_sentencizer", size)):
+        with costs.timed("readability_sentencizer", size):
+            return get_sentencizer_analyzer().suggest(text), "sentencizer"
+    return [], "skipped"
+
+
+def prepare_resume(resume_text, tracer=None, deadline=None, grammar_tips=None):
+    # grammar_tips: readability already computed by the caller (see
+    # prepare_resumes), so the stage is skipped here
+    tracer = tracer or Tracer()
+    degraded = {}
+
+    with tracer.span("tokenize_resume", input_size=len(resume_text)):
+        tokens, token_starts = tokenize_with_offsets(resume_text)
+        counts = term_counts(tokens)
+        keywords = keywords_from_tokens(tokens)
+        skills = get_skill_matcher().find(resume_text)
+
+    with tracer.span("sections", input_size=len(resume_text)):
+        sections = segment_sections(resume_text)
+        section_keywords = {
+            name: keywords_from_tokens(section_tokens(section, tokens, token_starts))
+            for name, section in sections.items()
+        }
+
+    if grammar_tips is None:
+        with tracer.span("readability", input_size=len(resume_text)):
+            grammar_tips, mode = _readability(resume_text, deadline)
+            if mode:
+                degraded["readability"] = mode
+
+    return ResumeArtifacts(
+        text=resume_text,
+        clean=" ".join(tokens),
+        tokens=tokens,
+        token_starts=token_starts,
+        term_counts=counts,
+        norm=vector_norm(counts),
+        keywords=keywords,
+        skills=skills,
+        sections=sections,
+        section_keywords=section_keywords,
+        grammar_tips=grammar_tips,
+        degraded=degraded,
+    )
+
+
+def prepare_resumes(resume_texts, tracer=None):
+    # Batch path: the readability parse for every text runs through one
+    # nlp.pipe stream instead of one pipeline call per resume
+    tracer = tracer or Tracer()
+    resume_texts = list(resume_texts)
+    with tracer.span("readability", input_size=sum(len(t) for t in resume_texts)):
+        all_tips = grammar_readability_suggestions_many(resume_texts)
+    return [prepare_resume(text, tracer=tracer, grammar_tips=tips) for text, tips in zip(resume_texts, all_tips)]
+
+
+def prepare_jd(jd_text, tracer=None):
+    tracer = tracer or Tracer()
+
+    with tracer.span("tokenize_jd", input_size=len(jd_text)):
+        clean = clean_text(jd_text)
+        tokens = clean.split()
+        counts = term_counts(tokens)
+        return JDArtifacts(
+            text=jd_text,
+            clean=clean,
+            tokens=tokens,
+            term_counts=counts,
+            norm=vector_norm(counts),
+            keywords=keywords_from_tokens(tokens),
+            skills=get_skill_matcher().find(jd_text),
+        )
+
+
+def score(resume, jd, tracer=None):
+    # Only the overlap terms are computed here, so re-scoring a held resume
+    # against an edited JD costs O(|JD|), not a re-parse.
+    tracer = tracer or Tracer()
+    degraded = dict(resume.degraded)
+
+    with tracer.span("ats_score", input_size=len(jd.term_counts)):
+        ats = ats_score_from_counts(
+            resume.term_counts, jd.term_counts, resume.keywords, jd.keywords,
+            resume_norm=resume.norm, jd_norm=jd.norm,
+        )
+
+    with tracer.span("skill_match", input_size=len(resume.keywords) + len(jd.keywords)):
+        matched_keywords = resume.keywords & jd.keywords
+        matched_skills, required_skills, skill_percent = skill_match(
+            resume.text, jd.text, resume_keys=resume.keywords, jd_keys=jd.keywords,
+            resume_skills=resume.skills, jd_skills=jd.skills,
+        )
+        total_jd_keywords = len(jd.keywords) if len(jd.keywords) > 0 else 1
+        keyword_overlap_percent = round((len(matched_keywords) / total_jd_keywords) * 100, 2)
+
+    with tracer.span("section_scores", input_size=len(resume.section_keywords)):
+        section_scores = {}
+        for name in SCORED_SECTIONS + tuple(n for n in resume.sections if n not in SCORED_SECTIONS):
+            section_scores[name] = section_score("", jd.keywords, section_keywords=resume.section_keywords.get(name, set()))
+
+    return AnalysisResult(
+        resume_text=resume.text,
+        jd_text=jd.text,
+        resume_clean=resume.clean,
+        jd_clean=jd.clean,
+        resume_tokens=resume.tokens,
+        jd_tokens=jd.tokens,
+        resume_keywords=resume.keywords,
+        jd_keywords=jd.keywords,
+        matched_keywords=matched_keywords,
+        missing=jd.keywords - resume.keywords,
+        score=ats,
+        matched_skills=matched_skills,
+        missing_skills=required_skills - matched_skills,
+        skill_percent=skill_percent,
+        keyword_overlap_percent=keyword_overlap_percent,
+        sections=resume.sections,
+        section_scores=section_scores,
+        grammar_tips=resume.grammar_tips,
+        degraded=degraded,
+    )
+
+
+def analyze(resume_text, jd_text, tracer=None, deadline=None):
+    # Each document is cleaned and tokenized exactly once; every later stage
+    # reuses those tokens/keyword sets instead of re-running the regexes.
+    # Pass a Tracer to observe per-stage timings (see STAGES). Callers that
+    # score one side against many of the other should hold on to
+    # prepare_resume()/prepare_jd() output and call score() directly.
+    # With a Deadline, stages that don't fit the remaining budget fall back
+    # to cheaper versions (see DEGRADED_MODES) instead of running late.
+    tracer = tracer or Tracer()
+    resume = prepare_resume(resume_text, tracer=tracer, deadline=deadline)
+    jd = prepare_jd(jd_text, tracer=tracer)
+    return score(resume, jd, tracer=tracer)
@@ -0,0 +1,118 @@
+import re
+
+from models import get_nlp, get_sentencizer
+
+# Only sentence boundaries and the dependency labels are read, so everything
+# else in en_core_web_sm is skipped. The parser only listens to tok2vec.
+UNUSED_COMPONENTS = ("tagger", "attribute_ruler", "lemmatizer", "ner")
+
+LONG_SENTENCE_TIP = "Your resume has very long sentences. Try breaking them into shorter ones."
+PASSIVE_VOICE_TIP = "Try to reduce passive voice. Use active voice to sound more confident."
+LOOKS_GOOD_TIP = "Your resume readability looks good. Minor improvements can enhance clarity."
+
+
+# Texts are parsed in chunks of whole sentences (split after ., ! or ?), so
+# the parse can stop as soon as both findings have been seen.
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+CHUNK_CHARS = 2000
+
+
+class ReadabilityAnalyzer:
+    def __init__(self, nlp=None, batch_size=32, n_process=1, long_sentence_words=25, chunk_chars=CHUNK_CHARS):
+        self.nlp = nlp if nlp is not None else get_nlp(exclude=UNUSED_COMPONENTS)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.long_sentence_words = long_sentence_words
+        self.chunk_chars = chunk_chars
+        # A blank fallback pipeline has no parser, so passive voice can never
+        # be detected; don't keep scanning for it.
+        self.can_detect_passive = "parser" in self.nlp.pipe_names
+
+    def chunks(self, text):
+        chunk, size = [], 0
+        for piece in _SENTENCE_END.split(text):
+            if chunk and size + len(piece) > self.chunk_chars:
+                yield " ".join(chunk)
+                chunk, size = [], 0
+            chunk.append(piece)
+            size += len(piece) + 1
+        if chunk:
+            yield " ".join(chunk)
+
+    def _new_state(self):
+        # [has_long, has_passive]; passive counts as "seen" when undetectable
+        return [False, not self.can_detect_passive]
+
+    def _update(self, state, doc):
+        for sent in doc.sents:
+            if not state[0] and len(sent.text.split()) > self.long_sentence_words:
+                state[0] = True
+            if not state[1] and any(token.dep_ == "auxpass" for token in sent):
+                state[1] = True
+            if state[0] and state[1]:
+                break
+
+    def _suggestions(self, state):
+        suggestions = []
+        if state[0]:
+            suggestions.append(LONG_SENTENCE_TIP)
+        if state[1] and self.can_detect_passive:
+            suggestions.append(PASSIVE_VOICE_TIP)
+        if not suggestions:
+            suggestions.append(LOOKS_GOOD_TIP)
+        return suggestions
+
+    def suggest(self, text):
+        # Chunk by chunk: once a long sentence and passive voice have both
+        # been found, the rest of the text is never parsed.
+        state = self._new_state()
+        for chunk in self.chunks(text):
+            self._update(state, self.nlp(chunk))
+            if state[0] and state[1]:
+                break
+        return self._suggestions(state)
+
+    def suggest_many(self, texts, batch_size=None, n_process=None):
+        # Yields one suggestion list per input text, in order. Chunks of all
+        # texts share one nlp.pipe stream; chunks of a text whose findings
+        # are already complete are not fed to the pipeline any more.
+        texts = list(texts)
+        states = [self._new_state() for _ in texts]
+
+        def stream():
+            for i, text in enumerate(texts):
+                for chunk in self.chunks(text):
+                    if states[i][0] and states[i][1]:
+                        break
+                    yield chunk, i
+
+        docs = self.nlp.pipe(
+            stream(),
+            as_tuples=True,
+            batch_size=batch_size or self.batch_size,
+            n_process=n_process or self.n_process,
+        )
+        for doc, i in docs:
+            if not (states[i][0] and states[i][1]):
+                self._update(states[i], doc)
+        for state in states:
+            yield self._suggestions(state)
+
+
+_analyzer = None
+_sentencizer_analyzer = None
+
+
+def get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = ReadabilityAnalyzer()
+    return _analyzer
+
+
+def get_sentencizer_analyzer():
+    # Degraded mode: long-sentence check only (no parser, so no passive voice)
+    global _sentencizer_analyzer
+    if _sentencizer_analyzer is None:
+        _sentencizer_analyzer = ReadabilityAnalyzer(nlp=get_sentencizer())
+    return _sentencizer_analyzer
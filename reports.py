@@ -0,0 +1,231 @@
+import io
+import os
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+
+WORKBOOK_FIELDS = [
+    "rank", "file", "ats_score", "skill_percent", "keyword_overlap_percent", "matched_count",
+    "missing_count", "missing_skills", "missing_keywords", "readability_tips", "duplicate_of", "duplicates", "error",
+]
+
+
+def candidate_from_result(result, name=""):
+    # Report row for one AnalysisResult, same keys batch.py produces
+    return {
+        "file": name,
+        "ats_score": result.score,
+        "skill_percent": result.skill_percent,
+        "keyword_overlap_percent": result.keyword_overlap_percent,
+        "matched_count": len(result.matched_skills),
+        "missing_count": len(result.missing_skills),
+        "matched_skills": sorted(result.matched_skills),
+        "missing_skills": sorted(result.missing_skills),
+        "missing_keywords": sorted(result.missing),
+        "readability_tips": list(result.grammar_tips),
+        "degraded": dict(result.degraded),
+    }
+
+
+# -------------------------
+# Per-candidate PDF
+# -------------------------
+class ReportWriter:
+    # Page geometry and font metrics are fixed once per writer (one per
+    # worker process), so each report only lays out its own lines. Text is
+    # wrapped to the page width and continues onto new pages as needed.
+    def __init__(self, pagesize=letter, margin=50, font="Helvetica", bold_font="Helvetica-Bold",
+                 font_size=10, leading=14, title="AI Resume Analyzer Report"):
+        self.pagesize = pagesize
+        self.width, self.height = pagesize
+        self.margin = margin
+        self.font = font
+        self.bold_font = bold_font
+        self.font_size = font_size
+        self.leading = leading
+        self.title = title
+        self.text_width = self.width - 2 * margin
+        self.top = self.height - margin
+        self.bottom = margin + leading
+
+    def render(self, row):
+        buffer = io.BytesIO()
+        self.write(row, buffer)
+        return buffer.getvalue()
+
+    def write(self, row, stream):
+        layout = _Layout(self, canvas.Canvas(stream, pagesize=self.pagesize, pageCompression=1))
+        layout.heading(self.title, size=self.font_size + 6)
+        if row.get("file"):
+            layout.paragraph(f"Candidate: {os.path.basename(row['file'])}")
+        if row.get("rank"):
+            layout.paragraph(f"Rank: {row['rank']}")
+        layout.gap()
+
+        if row.get("error"):
+            layout.paragraph(f"Analysis failed: {row['error']}")
+            layout.finish()
+            return
+
+        layout.paragraph(f"ATS Score: {row.get('ats_score')}%")
+        layout.paragraph(f"Skill Match: {row.get('skill_percent')}%")
+        if row.get("keyword_overlap_percent") is not None:
+            layout.paragraph(f"Keyword Overlap: {row['keyword_overlap_percent']}%")
+        layout.gap()
+
+        matched = row.get("matched_skills")
+        if matched:
+            layout.heading(f"Matched Skills ({len(matched)})")
+            layout.paragraph(", ".join(matched))
+            layout.gap()
+
+        missing_skills = row.get("missing_skills")
+        if missing_skills:
+            layout.heading(f"Missing Skills ({len(missing_skills)})")
+            layout.paragraph(", ".join(missing_skills))
+            layout.gap()
+
+        missing = row.get("missing_keywords") or []
+        layout.heading(f"Missing Keywords ({len(missing)})")
+        layout.paragraph(", ".join(missing) if missing else "None")
+        layout.gap()
+
+        layout.heading("AI Suggestions")
+        if (row.get("degraded") or {}).get("readability") == "skipped":
+            layout.paragraph("Readability check skipped to stay within the latency budget.")
+        for tip in row.get("readability_tips") or []:
+            layout.paragraph(f"- {tip}")
+
+        duplicates = row.get("duplicates")
+        if duplicates:
+            layout.gap()
+            layout.heading(f"Near-duplicate Submissions ({len(duplicates)})")
+            for name in duplicates:
+                layout.paragraph(f"- {os.path.basename(name)}")
+        layout.finish()
+
+
+class _Layout:
+    def __init__(self, writer, c):
+        self.w = writer
+        self.c = c
+        self.page = 1
+        self.y = writer.top
+
+    def _ensure_room(self, lines=1):
+        if self.y - (lines - 1) * self.w.leading < self.w.bottom:
+            self._footer()
+            self.c.showPage()
+            self.page += 1
+            self.y = self.w.top
+
+    def _footer(self):
+        self.c.setFont(self.w.font, self.w.font_size - 2)
+        self.c.drawRightString(self.w.width - self.w.margin, self.w.margin / 2, f"Page {self.page}")
+
+    def _draw(self, text, font, size):
+        self._ensure_room()
+        self.c.setFont(font, size)
+        self.c.drawString(self.w.margin, self.y, text)
+        self.y -= self.w.leading
+
+    def heading(self, text, size=None):
+        # Keep a heading together with at least the first line under it
+        self._ensure_room(2)
+        self._draw(text, self.w.bold_font, size or self.w.font_size + 1)
+
+    def paragraph(self, text):
+        for part in simpleSplit(text, self.w.font, self.w.font_size, self.w.text_width) or [""]:
+            self._draw(part, self.w.font, self.w.font_size)
+
+    def gap(self):
+        self.y -= self.w.leading / 2
+
+    def finish(self):
+        self._footer()
+        self.c.showPage()
+        self.c.save()
+
+
+_writer = None
+
+
+def _init_renderer(options):
+    global _writer
+    _writer = ReportWriter(**options)
+
+
+def _render(row):
+    return _writer.render(row)
+
+
+def render_reports(rows, workers=None, window=None, **options):
+    # Yields (row, pdf_bytes) in input order while worker processes render
+    # ahead. At most `window` reports are in flight, so memory stays flat
+    # however many rows there are.
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_renderer, initargs=(options,)) as pool:
+        pending = deque()
+        for row in rows:
+            pending.append((row, pool.submit(_render, row)))
+            if len(pending) >= window:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+
+def report_name(row, index):
+    stem = os.path.splitext(os.path.basename(row.get("file") or "candidate"))[0]
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", stem).strip("_") or "candidate"
+    prefix = f"{row['rank']:05d}" if isinstance(row.get("rank"), int) else f"x{index:05d}"
+    return f"{prefix}_{stem}.pdf"
+
+
+# -------------------------
+# Ranked workbook
+# -------------------------
+def _cell(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return " | ".join(str(v) for v in value)
+    return value
+
+
+def write_workbook(rows, target, fields=WORKBOOK_FIELDS):
+    # Streams rows through openpyxl's write-only mode; target is a path or
+    # a binary file object
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Ranked")
+    sheet.freeze_panes = "A2"
+    sheet.append(fields)
+    for row in rows:
+        sheet.append([_cell(row.get(field)) for field in fields])
+    workbook.save(target)
+
+
+# -------------------------
+# Archive
+# -------------------------
+def export_archive(rows, out_path, workers=None, **options):
+    # ranked.xlsx plus one PDF per successfully analyzed candidate under
+    # reports/, written into the zip as each one is rendered. rows should
+    # already be ranked (see batch.rank_results); returns the PDF count.
+    count = 0
+    with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("ranked.xlsx", "w") as f:
+            write_workbook(rows, f)
+        ok = (row for row in rows if not row.get("error"))
+        for index, (row, pdf) in enumerate(render_reports(ok, workers=workers, **options)):
+            # Page streams are already compressed
+            archive.writestr(f"reports/{report_name(row, index)}", pdf, compress_type=zipfile.ZIP_STORED)
+            count += 1
+    return count
@@ -0,0 +1,127 @@
+import numpy as np
+from scipy import sparse
+
+from utils import clean_text, extract_keywords, term_counts
+
+K1 = 1.2
+B = 0.75
+
+
+def query_terms(job_desc):
+    # JD side uses the same keywords the rest of the analyzer matches on
+    return extract_keywords(clean_text(job_desc))
+
+
+class BM25Index:
+    # Inverted index over a (documents x terms) count matrix, i.e. the CSR
+    # rows JobIndex and ResumeStore already build from clean_text tokens.
+    # Postings are doc-id sorted and hold precomputed BM25 impacts, so a
+    # query term is one vectorized scatter-add, and each term's max impact
+    # gives the upper bound used for max-score pruning.
+    def __init__(self, X, vocabulary=None, k1=K1, b=B):
+        # vocabulary: {term: column}, or anything with .get(); may be
+        # omitted when callers pass column ids to search_columns()
+        X = sparse.csr_matrix(X)
+        self.vocabulary = vocabulary
+        self.n_docs, self.n_terms = X.shape
+        self.k1 = k1
+        self.b = b
+
+        doc_len = np.asarray(X.sum(axis=1), dtype=np.float64).ravel()
+        avgdl = doc_len.mean() if self.n_docs else 0.0
+        len_norm = k1 * (1 - b + b * doc_len / avgdl) if avgdl else np.full(self.n_docs, k1)
+
+        postings = X.tocsc()
+        postings.sort_indices()
+        self._ptr = postings.indptr.astype(np.int64)
+        self._docs = postings.indices.astype(np.int32)
+        df = np.diff(self._ptr)
+        self.idf = np.log1p((self.n_docs - df + 0.5) / (df + 0.5))
+
+        # Full per-posting BM25 contribution (idf included)
+        tf = postings.data.astype(np.float64)
+        idf = np.repeat(self.idf, df)
+        self._impacts = (idf * tf * (k1 + 1) / (tf + len_norm[self._docs])).astype(np.float32)
+
+        self.upper_bounds = np.zeros(self.n_terms, dtype=np.float64)
+        nonempty = np.flatnonzero(df)
+        if len(nonempty):
+            self.upper_bounds[nonempty] = np.maximum.reduceat(self._impacts, self._ptr[nonempty])
+
+    @classmethod
+    def from_texts(cls, texts, **params):
+        vocabulary = {}
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            for term, count in term_counts(clean_text(text).split()).items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                data.append(count)
+            indptr.append(len(indices))
+        X = sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(vocabulary)), dtype=np.float64)
+        return cls(X, vocabulary, **params)
+
+    def search(self, job_desc, top_k=50, exclude=None):
+        # [(row, bm25), ...] best first; rows in exclude are never returned
+        terms = query_terms(job_desc)
+        cols = [self.vocabulary.get(t) for t in terms]
+        return self.search_columns([c for c in cols if c is not None], top_k, exclude)
+
+    def search_columns(self, cols, top_k=50, exclude=None):
+        cols = np.unique(np.asarray(cols, dtype=np.int64))
+        cols = cols[self.upper_bounds[cols] > 0] if len(cols) else cols
+        if not len(cols) or top_k <= 0 or not self.n_docs:
+            return []
+
+        # Highest-impact terms first; suffix[i] is the most any document can
+        # still gain from terms i.. onward, prefix[i] the most it can have
+        # gained from terms ..i
+        bounds = self.upper_bounds[cols]
+        order = np.argsort(-bounds, kind="stable")
+        cols, bounds = cols[order], bounds[order]
+        suffix = np.append(np.cumsum(bounds[::-1])[::-1], 0.0)
+        prefix = np.cumsum(bounds)
+        scores = np.zeros(self.n_docs, dtype=np.float64)
+        if exclude is not None and len(exclude):
+            # Stay at -inf whatever they gain, so they never set the threshold
+            scores[exclude] = -np.inf
+        candidates = None
+        theta = 0.0
+
+        for i, col in enumerate(cols):
+            start, end = self._ptr[col], self._ptr[col + 1]
+            docs = self._docs[start:end]
+            weights = self._impacts[start:end]
+
+            if candidates is None:
+                scores[docs] += weights
+                # theta can't exceed prefix[i], so skip the O(N) selection
+                # until pruning is possible at all
+                if prefix[i] <= suffix[i + 1]:
+                    continue
+                theta = self._kth_score(scores, top_k)
+                if theta > 0 and suffix[i + 1] < theta:
+                    # No document unseen so far can reach the top k any more:
+                    # the remaining lists are only probed for live candidates
+                    candidates = np.flatnonzero(scores + suffix[i + 1] >= theta)
+            else:
+                pos = np.searchsorted(docs, candidates)
+                pos[pos == len(docs)] = 0
+                hit = docs[pos] == candidates if len(docs) else np.zeros(len(candidates), dtype=bool)
+                scores[candidates[hit]] += weights[pos[hit]]
+                theta = max(theta, self._kth_score(scores[candidates], top_k))
+                candidates = candidates[scores[candidates] + suffix[i + 1] >= theta]
+
+        pool = candidates if candidates is not None else np.flatnonzero(scores > 0)
+        if len(pool) > top_k:
+            pool = pool[np.argpartition(-scores[pool], top_k - 1)[:top_k]]
+        pool = pool[np.lexsort((pool, -scores[pool]))]
+        return [(int(row), float(scores[row])) for row in pool]
+
+    @staticmethod
+    def _kth_score(scores, k):
+        if len(scores) < k:
+            return 0.0
+        return float(np.partition(scores, len(scores) - k)[len(scores) - k])
+
+    def __len__(self):
+        return self.n_docs
@@ -0,0 +1,72 @@
+import re
+from bisect import bisect_left
+from collections import namedtuple
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "technologies", "tech stack"],
+    "experience": ["experience", "work experience", "professional experience", "employment history", "work history", "internships", "internship"],
+    "projects": ["projects", "project", "personal projects", "academic projects", "key projects"],
+    "education": ["education", "academic background", "qualifications"],
+    "certifications": ["certifications", "certificates", "licenses and certifications"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments"],
+    "publications": ["publications", "research"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies"],
+}
+
+_ALIAS_TO_SECTION = {alias: name for name, aliases in SECTION_HEADINGS.items() for alias in aliases}
+_ALTERNATION = "|".join(
+    re.escape(alias).replace(r"\ ", r"\s+") for alias in sorted(_ALIAS_TO_SECTION, key=len, reverse=True)
+)
+# A heading owns its line: it starts the line and is followed by a colon or
+# the end of the line ("SKILLS", "Technical Skills: Python, SQL"), optionally
+# after a short parenthetical or a continuation marker ("Experience (cont.)",
+# "Projects - continued").
+_HEADING_TAIL = r"(?:[ \t]*(?:\([^()\n]{0,40}\)|[-\u2013\u2014]?[ \t]*(?:continued|cont(?:'d|\.)?)))?"
+_LINE_HEADING = re.compile(rf"(?im)^[ \t]*(?P<heading>{_ALTERNATION}){_HEADING_TAIL}[ \t]*(?::|$)")
+# Flattened text (no line breaks survived extraction): any whole-word match.
+_INLINE_HEADING = re.compile(rf"(?i)\b(?P<heading>{_ALTERNATION})\b")
+
+Section = namedtuple("Section", ["name", "heading", "spans"])
+
+
+def _normalize(heading):
+    return " ".join(heading.lower().split())
+
+
+def segment_sections(text):
+    # One scan finds every heading; each section runs from the end of its
+    # heading to the start of the next one. A section whose heading repeats
+    # (e.g. "Experience (cont.)" on page two) collects several spans.
+    matches = list(_LINE_HEADING.finditer(text))
+    if not matches:
+        matches = list(_INLINE_HEADING.finditer(text))
+
+    sections = {}
+    for i, match in enumerate(matches):
+        name = _ALIAS_TO_SECTION[_normalize(match.group("heading"))]
+        start = match.end()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        if name in sections:
+            sections[name].spans.append((start, end))
+        else:
+            sections[name] = Section(name, match.group("heading"), [(start, end)])
+    return sections
+
+
+def section_text(text, section):
+    return " ".join(text[start:end] for start, end in section.spans)
+
+
+def section_tokens(section, tokens, token_starts):
+    # Slices already-computed tokens (see utils.tokenize_with_offsets) instead
+    # of re-cleaning the section text.
+    out = []
+    for start, end in section.spans:
+        out.extend(tokens[bisect_left(token_starts, start):bisect_left(token_starts, end)])
+    return out
+
+
+def canonical_section(name):
+    return _ALIAS_TO_SECTION.get(_normalize(name), name)
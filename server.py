@@ -0,0 +1,295 @@
+import argparse
+import asyncio
+import base64
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from email.parser import BytesParser
+from email.policy import HTTP
+from urllib.parse import urlsplit
+
+from cache import LRUCache, analysis_key
+from deadline import Deadline
+from instrumentation import Tracer, Span, span_dict, registry
+from models import warm_up
+from pdf_service import ExtractionService
+
+logger = logging.getLogger("resume_analyzer.server")
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 422: "Unprocessable Entity", 429: "Too Many Requests",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------
+# Worker side (process pool)
+# -------------------------
+def _analyze_text(resume_text, job_desc, deadline=None):
+    from pipeline import analyze
+
+    tracer = Tracer(registry=None)
+    result = analyze(resume_text, job_desc, tracer=tracer, deadline=deadline)
+    return result.summary(), [tuple(s) for s in tracer.spans]
+
+
+# -------------------------
+# Request parsing
+# -------------------------
+def parse_analyze_body(content_type, body):
+    # Accepts multipart/form-data with a `resume` file and a `job_desc`
+    # field, or JSON {"resume_base64": ..., "job_desc": ...}. Either may
+    # carry an optional `budget_ms` latency budget.
+    content_type = content_type or ""
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+        )
+        fields = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name:
+                fields[name] = part.get_payload(decode=True) or b""
+        pdf_bytes = fields.get("resume")
+        job_desc = fields.get("job_desc", b"").decode("utf-8", errors="replace")
+        budget_ms = fields.get("budget_ms", b"").decode("ascii", errors="replace").strip() or None
+    elif content_type.startswith("application/json"):
+        try:
+            payload = json.loads(body)
+            pdf_bytes = base64.b64decode(payload.get("resume_base64") or "", validate=True)
+            job_desc = payload.get("job_desc") or ""
+            budget_ms = payload.get("budget_ms")
+        except (ValueError, TypeError, AttributeError) as e:
+            raise HttpError(400, f"Invalid JSON body: {e}")
+        if not isinstance(job_desc, str):
+            raise HttpError(400, "job_desc must be a string")
+    else:
+        raise HttpError(400, "Expected multipart/form-data or application/json")
+
+    if not pdf_bytes:
+        raise HttpError(400, "Missing resume PDF")
+    if not job_desc.strip():
+        raise HttpError(400, "Missing job_desc")
+    if budget_ms is not None:
+        try:
+            budget_ms = float(budget_ms)
+        except (TypeError, ValueError):
+            raise HttpError(400, "budget_ms must be a number")
+        if budget_ms <= 0:
+            raise HttpError(400, "budget_ms must be positive")
+    return pdf_bytes, job_desc, budget_ms
+
+
+async def read_request(reader):
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        # The stream limit is MAX_HEADER_BYTES: no blank line within it
+        raise HttpError(431, "Headers too large")
+    if len(head) > MAX_HEADER_BYTES:
+        raise HttpError(431, "Headers too large")
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), urlsplit(target).path, headers, body
+
+
+# -------------------------
+# Server
+# -------------------------
+class AnalysisServer:
+    # asyncio front end: parsing runs in ExtractionService's isolated
+    # workers, analysis in a bounded process pool. At most max_pending
+    # distinct analyses may be admitted at once; beyond that clients get 429.
+    # Identical in-flight requests (same PDF + JD hash and budget) share one
+    # computation.
+    # With a latency budget (server default or per request), the clock starts
+    # at admission and stages that would overrun it run degraded; degraded
+    # summaries say so and are not cached.
+    def __init__(self, workers=2, max_pending=16, extraction_timeout=20.0, cache_entries=256, latency_budget_ms=None):
+        self.workers = workers
+        self.latency_budget_ms = latency_budget_ms
+        self.max_pending = max_pending
+        self.extraction_timeout = extraction_timeout
+        self._results = LRUCache(max_entries=cache_entries, max_bytes=32 * 1024 * 1024)
+        self._inflight = {}
+        self._pending = 0
+        self._pool = None
+        self._threads = None
+        self._extraction = None
+
+    def start_pools(self):
+        self._pool = self._new_pool()
+        self._extraction = ExtractionService(workers=self.workers, timeout=self.extraction_timeout)
+        # ExtractionService.extract blocks while it supervises its worker
+        self._threads = ThreadPoolExecutor(max_workers=self.workers)
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=warm_up)
+
+    def _restart_pool(self, broken):
+        # Several requests can see the same dead pool; only the first swaps it
+        if self._pool is broken:
+            logger.error("Analysis worker died; restarting the process pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._new_pool()
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._extraction:
+            self._extraction.close()
+        if self._threads:
+            self._threads.shutdown(wait=False)
+
+    async def analyze(self, pdf_bytes, job_desc, budget_ms=None):
+        key = analysis_key(pdf_bytes, job_desc)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        # Only requests with the same budget share a computation, so an
+        # unbudgeted request never receives a degraded summary
+        budget_ms = budget_ms or self.latency_budget_ms
+        flight = (key, budget_ms)
+        shared = self._inflight.get(flight)
+        if shared is not None:
+            return await asyncio.shield(shared)
+
+        if self._pending >= self.max_pending:
+            raise HttpError(429, "Analyzer is at capacity, retry shortly")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[flight] = future
+        self._pending += 1
+        try:
+            deadline = Deadline.from_ms(budget_ms)
+            result = await self._compute(pdf_bytes, job_desc, deadline)
+            if not result["degraded"]:
+                self._results.put(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters (if any) consume the exception; don't warn when there are none
+            future.exception()
+            raise
+        finally:
+            self._pending -= 1
+            del self._inflight[flight]
+
+    async def _compute(self, pdf_bytes, job_desc, deadline=None):
+        loop = asyncio.get_running_loop()
+        extraction = await loop.run_in_executor(self._threads, self._extraction.extract, pdf_bytes)
+        registry.observe(Span("extract_text", extraction.seconds, 0.0, len(pdf_bytes), extraction.ok))
+        if extraction.error_type == "busy":
+            raise HttpError(503, extraction.error)
+        if not extraction.ok:
+            raise HttpError(422, f"{extraction.error_type}: {extraction.error}")
+
+        pool = self._pool
+        try:
+            summary, spans = await loop.run_in_executor(pool, _analyze_text, extraction.text, job_desc, deadline)
+        except BrokenProcessPool:
+            self._restart_pool(pool)
+            raise HttpError(503, "Analysis worker crashed, retry shortly")
+        spans = [Span(*s) for s in spans]
+        for span in spans:
+            registry.observe(span)
+        summary["timings"] = [span_dict(s) for s in spans]
+        return summary
+
+    async def handle(self, reader, writer):
+        status, payload, content_type = 500, {"error": "internal error"}, "application/json"
+        try:
+            method, path, headers, body = await read_request(reader)
+            if path == "/analyze":
+                if method != "POST":
+                    raise HttpError(405, "Use POST")
+                pdf_bytes, job_desc, budget_ms = parse_analyze_body(headers.get("content-type"), body)
+                status, payload = 200, await self.analyze(pdf_bytes, job_desc, budget_ms)
+            elif path == "/healthz":
+                status, payload = 200, {"status": "ok", "pending": self._pending}
+            elif path == "/metrics":
+                status, payload, content_type = 200, registry.prometheus_text(), "text/plain; version=0.0.4"
+            else:
+                raise HttpError(404, "Not found")
+        except HttpError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            status, payload = 400, {"error": "Malformed request"}
+        except Exception:
+            logger.exception("Unhandled error")
+            status, payload = 500, {"error": "internal error"}
+
+        data = payload.encode("utf-8") if isinstance(payload, str) else json.dumps(payload).encode("utf-8")
+        extra = "Retry-After: 1\r\n" if status in (429, 503) else ""
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"{extra}"
+            "Connection: close\r\n\r\n"
+        )
+        try:
+            writer.write(head.encode("latin-1") + data)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        self.start_pools()
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        logger.info("Listening on http://%s:%s", host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP analysis service: POST /analyze with a resume PDF and a JD.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2, help="Analysis/extraction worker processes")
+    parser.add_argument("--max-pending", type=int, default=16, help="Distinct analyses admitted before returning 429")
+    parser.add_argument("--extraction-timeout", type=float, default=20.0)
+    parser.add_argument("--latency-budget-ms", type=float, default=None,
+                        help="Default per-request budget; over-budget stages run degraded (requests may send budget_ms)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = AnalysisServer(workers=args.workers, max_pending=args.max_pending,
+                            extraction_timeout=args.extraction_timeout, latency_budget_ms=args.latency_budget_ms)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import csv
+import json
+import os
+import re
+import threading
+from collections import deque
+
+DEFAULT_TAXONOMY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills.json")
+
+# Like clean_text() tokens, but keeps trailing + and # so "C++" and "C#"
+# don't collapse into the letter "c".
+_TOKEN = re.compile(r"[a-zA-Z0-9]+[+#]*")
+
+
+def skill_tokens(text):
+    return [t.lower() for t in _TOKEN.findall(text)]
+
+
+# -------------------------
+# Taxonomy loading
+# -------------------------
+def load_taxonomy(path=DEFAULT_TAXONOMY):
+    # {canonical name: [synonyms]} from JSON, or CSV/TSV/text rows of
+    # "canonical,synonym,synonym..." (tabs or '|' also accepted).
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return {name: [] for name in data}
+        return {name: list(synonyms or []) for name, synonyms in data.items()}
+
+    taxonomy = {}
+    with open(path, encoding="utf-8", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        delimiter = "\t" if "\t" in sample else "|" if "|" in sample else ","
+        for row in csv.reader(f, delimiter=delimiter):
+            row = [cell.strip() for cell in row if cell.strip()]
+            if not row or row[0].startswith("#"):
+                continue
+            taxonomy.setdefault(row[0], []).extend(row[1:])
+    return taxonomy
+
+
+# -------------------------
+# Token-level Aho-Corasick
+# -------------------------
+class SkillMatcher:
+    # Compiles every skill phrase and synonym into one automaton over
+    # tokens, so finding all skills in a text is a single pass whose cost
+    # depends on the text length, not on the taxonomy size.
+    def __init__(self, taxonomy):
+        self.names = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for name, synonyms in taxonomy.items():
+            skill_id = len(self.names)
+            self.names.append(name)
+            for phrase in [name, *synonyms]:
+                tokens = skill_tokens(phrase)
+                if tokens:
+                    self._add(tokens, skill_id)
+        self._build_links()
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TAXONOMY):
+        return cls(load_taxonomy(path))
+
+    def _add(self, tokens, skill_id):
+        node = 0
+        for token in tokens:
+            nxt = self._goto[node].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if skill_id not in self._out[node]:
+            self._out[node].append(skill_id)
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                if node == 0:
+                    continue
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                # Inherit matches that end here via the failure chain
+                self._out[child].extend(s for s in self._out[self._fail[child]] if s not in self._out[child])
+
+    def find_ids(self, tokens):
+        found = set()
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for token in tokens:
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def find(self, text):
+        return {self.names[i] for i in self.find_ids(skill_tokens(text))}
+
+    def __len__(self):
+        return len(self.names)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_skill_matcher():
+    # Shared, compiled once per process
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = SkillMatcher.from_file(DEFAULT_TAXONOMY)
+    return _default
+
+
+def set_skill_matcher(matcher):
+    # Swap in a larger/custom taxonomy, e.g. SkillMatcher.from_file(path)
+    global _default
+    with _default_lock:
+        _default = matcher
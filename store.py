@@ -0,0 +1,557 @@
+import argparse
+import io
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, one writer at a time
+    fcntl = None
+
+import numpy as np
+from scipy import sparse
+
+from cache import content_hash
+from dedup import DEFAULT_THRESHOLD, LSHIndex, minhash
+from job_index import JobIndex
+from retrieval import BM25Index, query_terms
+from pdf_text import DEFAULT_MAX_PAGES, DEFAULT_MAX_CHARS
+from utils import clean_text, extract_text_from_pdf, term_counts, vector_norm
+from vocab import KeywordCorpus
+
+# On-disk layout of a store directory:
+#   store.db     SQLite: one row per resume (hash, filename, text, MinHash
+#                signature, near-duplicate link) + term ids
+#   indices.i32  CSR column ids, rows appended back to back
+#   counts.i32   CSR term counts, parallel to indices.i32
+#   indptr.i64   CSR row offsets (rows + 1 entries, starts with 0)
+#   norms.f64    L2 norm of each resume's full term-count vector
+#   write.lock   held (flock) by whichever process is appending
+# The binary files are append-only and are memory-mapped on load, so a new
+# process can score a JD against every stored resume without re-parsing or
+# reading the matrix into memory first.
+INDEX_DTYPE = np.int32
+COUNT_DTYPE = np.int32
+INDPTR_DTYPE = np.int64
+NORM_DTYPE = np.float64
+
+_FILES = {
+    "indices": ("indices.i32", INDEX_DTYPE),
+    "counts": ("counts.i32", COUNT_DTYPE),
+    "indptr": ("indptr.i64", INDPTR_DTYPE),
+    "norms": ("norms.f64", NORM_DTYPE),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    row INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,
+    filename TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL,
+    added_at REAL NOT NULL,
+    signature BLOB,
+    duplicate_of INTEGER
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+"""
+
+
+def _extract_worker(path, limits):
+    try:
+        return extract_text_from_pdf(path, **limits), ""
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _signature_blob(signature):
+    # b"" marks a text without tokens (no signature); NULL means not computed yet
+    return b"" if signature is None else signature.tobytes()
+
+
+class ResumeStore:
+    # Persistent pool of parsed resumes keyed by PDF content hash. Appends
+    # are incremental (already-stored PDFs are skipped before parsing) and
+    # the term matrix is opened zero-copy with np.memmap. Writers take an
+    # exclusive lock file; readers never lock or modify the binary files and
+    # see rows once their transaction commits.
+    # Resumes whose MinHash Jaccard estimate against an earlier one reaches
+    # dedup_threshold are stored with duplicate_of set and left out of
+    # rank()/search() results (dedup_threshold=None turns this off).
+    def __init__(self, path, dedup_threshold=DEFAULT_THRESHOLD):
+        self.path = path
+        self.dedup_threshold = dedup_threshold
+        os.makedirs(path, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(path, "store.db"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+        self._term_ids = None
+        self._lsh = None
+        self._matrix = None
+        self._bm25 = None
+        self._keywords = None
+        # Rows this instance has seen committed; if another writer got in
+        # between, the cached vocabulary and LSH index are reloaded
+        self._rows_seen = None
+
+    def _file(self, name):
+        return os.path.join(self.path, _FILES[name][0])
+
+    def _migrate(self):
+        # Stores created before near-duplicate tracking; signatures are
+        # backfilled from the stored text when the LSH index is first built
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(resumes)")}
+        with self._db:
+            if "signature" not in columns:
+                self._db.execute("ALTER TABLE resumes ADD COLUMN signature BLOB")
+            if "duplicate_of" not in columns:
+                self._db.execute("ALTER TABLE resumes ADD COLUMN duplicate_of INTEGER")
+
+    @contextmanager
+    def _write_lock(self):
+        with open(os.path.join(self.path, "write.lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield
+
+    def _repair(self):
+        # SQLite is the commit point: binary data is written and fsynced
+        # before the row is inserted, so anything past the committed row
+        # count is a torn append and gets truncated. Only ever called under
+        # _write_lock(): bytes past the committed count may otherwise be an
+        # append another writer is about to commit.
+        rows = len(self)
+        indptr_path = self._file("indptr")
+        if not os.path.exists(indptr_path) or os.path.getsize(indptr_path) == 0:
+            with open(indptr_path, "wb") as f:
+                f.write(np.zeros(1, dtype=INDPTR_DTYPE).tobytes())
+        itemsize = np.dtype(INDPTR_DTYPE).itemsize
+        with open(indptr_path, "r+b") as f:
+            f.truncate((rows + 1) * itemsize)
+            f.seek(rows * itemsize)
+            nnz = int(np.frombuffer(f.read(itemsize), dtype=INDPTR_DTYPE)[0])
+        for name, size in (("indices", nnz), ("counts", nnz), ("norms", rows)):
+            path = self._file(name)
+            with open(path, "ab") as f:
+                f.truncate(size * np.dtype(_FILES[name][1]).itemsize)
+
+    # -------------------------
+    # Vocabulary
+    # -------------------------
+    def _load_terms(self):
+        if self._term_ids is None:
+            self._term_ids = dict(self._db.execute("SELECT term, id FROM terms"))
+        return self._term_ids
+
+    def _select_in(self, query, values):
+        # query has one "{marks}" placeholder for an IN (...) list
+        values = list(values)
+        for i in range(0, len(values), 500):
+            chunk = values[i:i + 500]
+            yield from self._db.execute(query.format(marks=",".join("?" * len(chunk))), chunk)
+
+    def term_ids(self, terms):
+        # {term: column} for just the given terms; no full vocabulary load.
+        # Always read from SQLite (never the writer's cached dict), so terms
+        # other processes have committed since are seen.
+        return dict(self._select_in("SELECT term, id FROM terms WHERE term IN ({marks})", set(terms)))
+
+    def terms(self, ids):
+        # {id: term} for just the given column ids
+        return dict(self._select_in("SELECT id, term FROM terms WHERE id IN ({marks})", (int(i) for i in ids)))
+
+    def _load_lsh(self):
+        if self._lsh is None:
+            lsh = LSHIndex(self.dedup_threshold)
+            missing = []
+            for row, blob, text in self._db.execute(
+                "SELECT row, signature, CASE WHEN signature IS NULL THEN text END FROM resumes "
+                "WHERE duplicate_of IS NULL ORDER BY row"
+            ):
+                if blob is None:
+                    signature = minhash(text)
+                    missing.append((_signature_blob(signature), row))
+                else:
+                    signature = np.frombuffer(blob, dtype=np.uint32) if blob else None
+                lsh.add(row, signature)
+            if missing:
+                with self._db:
+                    self._db.executemany("UPDATE resumes SET signature = ? WHERE row = ?", missing)
+            self._lsh = lsh
+        return self._lsh
+
+    @property
+    def n_terms(self):
+        return self._db.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+
+    # -------------------------
+    # Appends
+    # -------------------------
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def __contains__(self, sha256):
+        return self._db.execute("SELECT 1 FROM resumes WHERE sha256 = ?", (sha256,)).fetchone() is not None
+
+    def row_for(self, sha256):
+        found = self._db.execute("SELECT row FROM resumes WHERE sha256 = ?", (sha256,)).fetchone()
+        return found[0] if found else None
+
+    def add_text(self, sha256, text, filename=""):
+        # Returns (row, added); a hash already in the store is not re-added
+        return self.add_many([(sha256, text, filename)])[0]
+
+    def add(self, pdf_bytes, filename="", extract=extract_text_from_pdf):
+        sha256 = content_hash(pdf_bytes)
+        row = self.row_for(sha256)
+        if row is not None:
+            return row, False
+        return self.add_text(sha256, extract(io.BytesIO(pdf_bytes)), filename)
+
+    def add_many(self, items):
+        # items: iterable of (sha256, text, filename). One fsync and one
+        # transaction for the whole batch, under the writer lock.
+        items = list(items)
+        with self._write_lock():
+            # Truncate whatever a crashed writer left behind before appending
+            self._repair()
+            return self._add_locked(items)
+
+    def _add_locked(self, items):
+        # Only this batch's hashes are looked up, not the whole store
+        existing = dict(self._select_in(
+            "SELECT sha256, row FROM resumes WHERE sha256 IN ({marks})", {sha256 for sha256, _, _ in items}
+        ))
+        next_row = self._db.execute("SELECT COALESCE(MAX(row), -1) + 1 FROM resumes").fetchone()[0]
+        if self._rows_seen != next_row:
+            self._term_ids = None
+            self._lsh = None
+        term_ids = self._load_terms()
+        lsh = self._load_lsh() if self.dedup_threshold else None
+        self._rows_seen = next_row
+        nnz = int(self._read_indptr_tail())
+
+        results, records, new_terms = [], [], []
+        indices_parts, counts_parts, indptr_parts, norms = [], [], [], []
+        for sha256, text, filename in items:
+            if sha256 in existing:
+                results.append((existing[sha256], False))
+                continue
+            counts = term_counts(clean_text(text).split())
+            cols = []
+            for term in counts:
+                col = term_ids.get(term)
+                if col is None:
+                    col = term_ids[term] = len(term_ids)
+                    new_terms.append((col, term))
+                cols.append(col)
+            order = np.argsort(cols)
+            indices_parts.append(np.asarray(cols, dtype=INDEX_DTYPE)[order])
+            counts_parts.append(np.fromiter(counts.values(), dtype=COUNT_DTYPE, count=len(counts))[order])
+            nnz += len(counts)
+            indptr_parts.append(nnz)
+            norms.append(vector_norm(counts))
+            signature = minhash(text)
+            duplicate_of = lsh.find_duplicate(signature) if lsh is not None else None
+            if lsh is not None and duplicate_of is None:
+                lsh.add(next_row, signature)
+            records.append((next_row, sha256, filename, text, time.time(), _signature_blob(signature), duplicate_of))
+            existing[sha256] = next_row
+            results.append((next_row, True))
+            next_row += 1
+
+        if not records:
+            return results
+
+        try:
+            self._append("indices", np.concatenate(indices_parts))
+            self._append("counts", np.concatenate(counts_parts))
+            self._append("norms", np.asarray(norms, dtype=NORM_DTYPE))
+            self._append("indptr", np.asarray(indptr_parts, dtype=INDPTR_DTYPE))
+            with self._db:
+                self._db.executemany("INSERT INTO terms (id, term) VALUES (?, ?)", new_terms)
+                self._db.executemany(
+                    "INSERT INTO resumes (row, sha256, filename, text, added_at, signature, duplicate_of) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", records
+                )
+        except BaseException:
+            # Drop the uncommitted tail and the in-memory indexes with it
+            self._term_ids = None
+            self._lsh = None
+            self._repair()
+            raise
+        finally:
+            self._matrix = None
+        self._rows_seen = next_row
+        return results
+
+    def _append(self, name, array):
+        with open(self._file(name), "ab") as f:
+            f.write(array.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_indptr_tail(self):
+        itemsize = np.dtype(INDPTR_DTYPE).itemsize
+        with open(self._file("indptr"), "rb") as f:
+            f.seek(len(self) * itemsize)
+            return np.frombuffer(f.read(itemsize), dtype=INDPTR_DTYPE)[0]
+
+    def ingest_folder(self, folder, workers=None, on_result=None, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                      batch_size=64):
+        # Hashes every PDF first and only parses the ones not stored yet.
+        # Returns {"added": n, "skipped": n, "duplicates": n, "errors": [(path, message)]}
+        # where duplicates counts added resumes flagged as near-duplicates.
+        from batch import find_pdfs
+
+        pending = []
+        duplicates_before = self._count_duplicates()
+        summary = {"added": 0, "skipped": 0, "duplicates": 0, "errors": []}
+        for path in find_pdfs(folder):
+            with open(path, "rb") as f:
+                sha256 = content_hash(f.read())
+            if sha256 in self:
+                summary["skipped"] += 1
+            else:
+                pending.append((path, sha256))
+
+        limits = {"max_pages": max_pages, "max_chars": max_chars}
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                extracted = pool.map(_extract_worker, [p for p, _ in chunk], [limits] * len(chunk))
+                batch = []
+                for (path, sha256), (text, error) in zip(chunk, extracted):
+                    if error:
+                        summary["errors"].append((path, error))
+                    else:
+                        batch.append((sha256, text, os.path.relpath(path, folder)))
+                    done += 1
+                    if on_result:
+                        on_result(path, error, done, len(pending))
+                summary["added"] += sum(added for _, added in self.add_many(batch))
+        summary["duplicates"] = self._count_duplicates() - duplicates_before
+        return summary
+
+    # -------------------------
+    # Near-duplicates
+    # -------------------------
+    def _count_duplicates(self):
+        return self._db.execute("SELECT COUNT(*) FROM resumes WHERE duplicate_of IS NOT NULL").fetchone()[0]
+
+    def duplicate_rows(self):
+        rows = self._db.execute("SELECT row FROM resumes WHERE duplicate_of IS NOT NULL")
+        return np.fromiter((row for (row,) in rows), dtype=np.int64)
+
+    def duplicate_of(self, row):
+        found = self._db.execute("SELECT duplicate_of FROM resumes WHERE row = ?", (row,)).fetchone()
+        if found is None:
+            raise KeyError(row)
+        return found[0]
+
+    def duplicates(self, rows):
+        # {row: [filenames of resumes flagged as its near-duplicates]}
+        marks = ",".join("?" * len(rows))
+        found = {row: [] for row in rows}
+        for original, filename in self._db.execute(
+            f"SELECT duplicate_of, filename FROM resumes WHERE duplicate_of IN ({marks}) ORDER BY row", rows
+        ):
+            found[original].append(filename)
+        return found
+
+    # -------------------------
+    # Loading and scoring
+    # -------------------------
+    def _map(self, name, count):
+        filename, dtype = _FILES[name]
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode="r", shape=(count,))
+
+    def matrix(self):
+        # (X, norms) over every stored resume; X is an (N x n_terms) CSR
+        # count matrix whose arrays are read-only views of the store files.
+        rows = len(self)
+        if self._matrix is None or self._matrix[0].shape[0] != rows:
+            indptr = self._map("indptr", rows + 1) if rows else np.zeros(1, dtype=INDPTR_DTYPE)
+            nnz = int(indptr[-1])
+            X = sparse.csr_matrix(
+                (self._map("counts", nnz), self._map("indices", nnz), indptr),
+                shape=(rows, self.n_terms), copy=False,
+            )
+            self._matrix = (X, self._map("norms", rows))
+        return self._matrix
+
+    def job_index(self, job_desc):
+        X, _ = self.matrix()
+        jd_terms = term_counts(clean_text(job_desc).split())
+        return JobIndex(job_desc, vocabulary=self.term_ids(jd_terms), n_features=X.shape[1])
+
+    def score(self, job_desc):
+        # Same values as ats_score(clean_text(resume), clean_text(job_desc))
+        # for every stored resume, in row order
+        X, norms = self.matrix()
+        return self.job_index(job_desc).score_matrix(X, norms)
+
+    def rank(self, job_desc, top_k=50, collapse_duplicates=True):
+        # Collapsed near-duplicates are listed under their original's hit
+        scores = self.score(job_desc)
+        candidates = len(scores)
+        if collapse_duplicates:
+            duplicates = self.duplicate_rows()
+            scores[duplicates] = -np.inf
+            candidates -= len(duplicates)
+        top_k = min(top_k, candidates)
+        if top_k <= 0:
+            return []
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return self._hits([int(i) for i in top], job_desc, collapse_duplicates, ats_score=scores[top].tolist())
+
+    def _hits(self, rows, job_desc, collapse_duplicates, **columns):
+        names = self.filenames(rows)
+        duplicates = self.duplicates(rows) if collapse_duplicates else {}
+        corpus = self.keyword_corpus()
+        query = corpus.encode_query(query_terms(job_desc))
+        overlap = corpus.match_percents(query, rows)
+        missing = corpus.missing(query, rows)
+        hits = []
+        for i, row in enumerate(rows):
+            hit = {"row": row, "file": names[row]}
+            hit.update((name, values[i]) for name, values in columns.items())
+            hit["keyword_overlap_percent"] = float(overlap[i])
+            hit["missing_keywords"] = sorted(missing[i])
+            if collapse_duplicates:
+                hit["duplicates"] = duplicates[row]
+            hits.append(hit)
+        return hits
+
+    def keyword_corpus(self):
+        # KeywordCorpus over the mapped rows: a row's column ids are already
+        # sorted and unique, so nothing is copied, and only the JD's terms
+        # are looked up in SQLite. Overlap with a JD's keywords equals the
+        # keyword term of ats_score.
+        X, _ = self.matrix()
+        if self._keywords is None or len(self._keywords) != X.shape[0]:
+            self._keywords = KeywordCorpus(X.indptr, X.indices.view(np.uint32), vocab=self)
+        return self._keywords
+
+    def bm25_index(self):
+        # Built once per process from the mapped matrix; rebuilt after appends
+        X, _ = self.matrix()
+        if self._bm25 is None or self._bm25.n_docs != X.shape[0]:
+            self._bm25 = BM25Index(X)
+        return self._bm25
+
+    def search(self, job_desc, top_k=50, rerank=False, collapse_duplicates=True):
+        # Top-k retrieval by BM25 over the JD's keywords. With rerank=True
+        # the shortlist is re-ordered by ats_score (computed exactly, from
+        # the stored rows only).
+        index = self.bm25_index()
+        exclude = self.duplicate_rows() if collapse_duplicates else None
+        cols = list(self.term_ids(query_terms(job_desc)).values())
+        hits = index.search_columns(cols, top_k, exclude=exclude)
+        if not hits:
+            return []
+        rows = [row for row, _ in hits]
+        results = self._hits(rows, job_desc, collapse_duplicates, bm25=[round(bm25, 4) for _, bm25 in hits])
+        if rerank:
+            X, norms = self.matrix()
+            ats = self.job_index(job_desc).score_matrix(X[rows], np.asarray(norms[rows]))
+            for result, value in zip(results, ats):
+                result["ats_score"] = float(value)
+            results.sort(key=lambda r: (r["ats_score"], r["bm25"]), reverse=True)
+        return results
+
+    def filenames(self, rows):
+        marks = ",".join("?" * len(rows))
+        return dict(self._db.execute(f"SELECT row, filename FROM resumes WHERE row IN ({marks})", rows))
+
+    def text(self, row):
+        found = self._db.execute("SELECT text FROM resumes WHERE row = ?", (row,)).fetchone()
+        if found is None:
+            raise KeyError(row)
+        return found[0]
+
+    def close(self):
+        self._matrix = None
+        self._bm25 = None
+        self._keywords = None
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Persistent resume pool: ingest PDFs once, rank them against any JD.")
+    parser.add_argument("--store", required=True, help="Store directory (created if missing)")
+    parser.add_argument("--dedup-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated Jaccard similarity at which ingested resumes count as duplicates (0 disables)")
+    parser.add_argument("--keep-duplicates", action="store_true", help="List near-duplicates individually in results")
+    parser.add_argument("--show-missing", action="store_true", help="Append each hit's missing JD keywords")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Add a folder of resume PDFs (already stored PDFs are skipped)")
+    ingest.add_argument("folder")
+    ingest.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    ingest.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES)
+    ingest.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS)
+
+    rank = commands.add_parser("rank", help="Rank every stored resume against a job description")
+    rank.add_argument("--jd", required=True, help="Path to a text file with the job description")
+    rank.add_argument("--top", type=int, default=50)
+
+    search = commands.add_parser("search", help="BM25 top-k retrieval over the stored resumes")
+    search.add_argument("--jd", required=True, help="Path to a text file with the job description")
+    search.add_argument("--top", type=int, default=50)
+    search.add_argument("--rerank", action="store_true", help="Re-order the shortlist by ATS score")
+    args = parser.parse_args(argv)
+
+    def label(hit):
+        extra = len(hit.get("duplicates") or [])
+        text = f"{hit['file']} (+{extra} duplicates)" if extra else hit["file"]
+        if args.show_missing:
+            text += "\t" + ", ".join(hit["missing_keywords"])
+        return text
+
+    collapse = not args.keep_duplicates
+    with ResumeStore(args.store, dedup_threshold=args.dedup_threshold or None) as store:
+        if args.command == "ingest":
+            summary = store.ingest_folder(args.folder, workers=args.workers,
+                                          max_pages=args.max_pages, max_chars=args.max_chars)
+            for path, error in summary["errors"]:
+                print(f"{path}: {error}", file=sys.stderr)
+            print(f"Added {summary['added']} ({summary['duplicates']} near-duplicates), skipped "
+                  f"{summary['skipped']} already stored, {len(summary['errors'])} failed; "
+                  f"{len(store)} resumes in store", file=sys.stderr)
+        elif args.command == "rank":
+            with open(args.jd, encoding="utf-8") as f:
+                job_desc = f.read()
+            for i, hit in enumerate(store.rank(job_desc, top_k=args.top, collapse_duplicates=collapse), start=1):
+                print(f"{i}\t{hit['ats_score']}\t{label(hit)}")
+        else:
+            with open(args.jd, encoding="utf-8") as f:
+                job_desc = f.read()
+            hits = store.search(job_desc, top_k=args.top, rerank=args.rerank, collapse_duplicates=collapse)
+            for i, hit in enumerate(hits, start=1):
+                score = hit.get("ats_score", hit["bm25"])
+                print(f"{i}\t{score}\t{label(hit)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from sections import section_text, segment_sections
+
+RESUME = """Jane Doe
+Experience
+Acme Corp - built data pipelines
+Education
+B.Sc. Computer Science
+Experience (cont.)
+Globex - led the platform team
+Projects - continued
+Search engine in Rust
+"""
+
+
+def test_repeated_heading_collects_spans():
+    sections = segment_sections(RESUME)
+    experience = sections["experience"]
+    assert len(experience.spans) == 2
+    assert "Globex" in section_text(RESUME, experience)
+    assert "Globex" not in section_text(RESUME, sections["education"])
+    assert "Rust" in section_text(RESUME, sections["projects"])
+
+
+def test_heading_with_parenthetical_and_colon():
+    sections = segment_sections("Skills (technical): Python, SQL\nEducation\nMIT")
+    assert section_text("Skills (technical): Python, SQL\nEducation\nMIT", sections["skills"]).strip() == "Python, SQL"
+
+
+def test_heading_word_inside_sentence_is_not_a_heading():
+    sections = segment_sections("Summary\nExperience with Python and projects at scale\n")
+    assert list(sections) == ["summary"]
@@ -0,0 +1,36 @@
+from store import ResumeStore
+from utils import ats_score, clean_text
+
+JD = "kubernetes terraform golang"
+
+
+def test_reader_sees_terms_committed_by_another_writer(tmp_path):
+    a = ResumeStore(str(tmp_path))
+    b = ResumeStore(str(tmp_path))
+    try:
+        a.add_text("a", "python developer with sql experience")
+        row, added = b.add_text("b", "kubernetes terraform golang expert")
+        assert added
+
+        expected = ats_score(clean_text(b.text(row)), clean_text(JD))
+        assert a.score(JD)[row] == expected
+        assert [hit["row"] for hit in a.search(JD, top_k=1)] == [row]
+        assert a.rank(JD, top_k=1)[0]["missing_keywords"] == []
+    finally:
+        a.close()
+        b.close()
+
+
+def test_writers_interleave_without_clobbering_terms(tmp_path):
+    a = ResumeStore(str(tmp_path))
+    b = ResumeStore(str(tmp_path))
+    try:
+        a.add_text("1", "alpha beta")
+        b.add_text("2", "gamma delta")
+        row, _ = a.add_text("3", "gamma epsilon")
+        assert a.add_text("2", "gamma delta") == (1, False)
+        for store in (a, b):
+            assert store.score("gamma epsilon")[row] == ats_score("gamma epsilon", "gamma epsilon")
+    finally:
+        a.close()
+        b.close()
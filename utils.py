@@ -1,42 +1,40 @@
 import re
-import os
-import nltk
-import spacy
-from sklearn.feature_extraction.text import CountVectorizer
-import pdfplumber
+from collections import Counter
 
-# -------------------------
-# NLTK setup (cloud-safe)
-# -------------------------
-NLTK_DATA_DIR = os.path.join(os.path.dirname(__file__), 'nltk_data')
-nltk.data.path.append(NLTK_DATA_DIR)
+from models import get_nlp
+from readability import get_analyzer
+from pdf_text import extract_text
+from sections import segment_sections, section_text, canonical_section
+from skills import get_skill_matcher
 
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', download_dir=NLTK_DATA_DIR)
 
-# -------------------------
-# spaCy setup (cloud-safe)
-# -------------------------
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    nlp = spacy.blank("en")
-    if "sentencizer" not in nlp.pipe_names:
-        nlp.add_pipe("sentencizer")
+def __getattr__(name):
+    # Backwards compatibility for code that used the old module-level
+    # ``utils.nlp``; the model is now only loaded when first needed.
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # -------------------------
 # Core Functions
 # -------------------------
-def extract_text_from_pdf(pdf_file):
-    text = ""
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + " "
-    return text
+def extract_text_from_pdf(pdf_file, max_pages=None, max_chars=None, workers=1):
+    return extract_text(pdf_file, max_pages=max_pages, max_chars=max_chars, workers=workers)
+
+
+_TOKEN = re.compile(r'[a-zA-Z0-9]+')
+
+
+def tokenize_with_offsets(text):
+    # Same tokens as clean_text(text).split(), plus where each one starts in
+    # the original text so spans (e.g. resume sections) can be sliced later.
+    tokens = []
+    starts = []
+    for match in _TOKEN.finditer(text):
+        tokens.append(match.group(0).lower())
+        starts.append(match.start())
+    return tokens, starts
 
 
 def clean_text(text):
@@ -45,7 +43,9 @@ def clean_text(text):
     return text.lower().strip()
 
 
-def ats_score(resume_text, job_desc):
+def ats_score(resume_text, job_desc, resume_keywords=None, jd_keywords=None):
+    from sklearn.feature_extraction.text import CountVectorizer
+
     # Semantic similarity (cosine)
     vectorizer = CountVectorizer().fit_transform([resume_text, job_desc])
     vectors = vectorizer.toarray()
@@ -58,8 +58,14 @@ def ats_score(resume_text, job_desc):
     semantic_score = semantic_score * 100
 
     # Keyword overlap
-    resume_keywords = extract_keywords(resume_text)
-    jd_keywords = extract_keywords(job_desc)
+    if resume_keywords is None:
+        resume_keywords = extract_keywords(resume_text)
+    if jd_keywords is None:
+        jd_keywords = extract_keywords(job_desc)
+    return combine_ats_score(semantic_score, resume_keywords, jd_keywords)
+
+
+def combine_ats_score(semantic_score, resume_keywords, jd_keywords):
     total_required = len(jd_keywords) if len(jd_keywords) > 0 else 1
     keyword_overlap = (len(resume_keywords & jd_keywords) / total_required) * 100
 
@@ -75,23 +81,64 @@ def ats_score(resume_text, job_desc):
 
     return round(min(final_score, 100), 2)
 
-def extract_keywords(text):
-    text = clean_text(text)
-    words = text.split()
 
-    # remove junk words
-    stopwords = set([
-        "and","or","the","is","are","a","an","with","to","for","in","on","of","as","by",
-        "this","that","from","be","will","has","have","had","it","at"
-    ])
+def term_counts(tokens):
+    # Bag of words exactly as CountVectorizer sees cleaned text (its default
+    # token pattern keeps tokens of two or more characters)
+    return Counter(t for t in tokens if len(t) > 1)
+
 
-    keywords = set(w for w in words if len(w) > 2 and w not in stopwords)
-    return keywords
+def vector_norm(counts):
+    return sum(c * c for c in counts.values()) ** 0.5
 
 
-def skill_match(resume_text, jd_text):
-    resume_keys = extract_keywords(resume_text)
-    jd_keys = extract_keywords(jd_text)
+def ats_score_from_counts(resume_counts, jd_counts, resume_keywords, jd_keywords, resume_norm=None, jd_norm=None):
+    # Same score as ats_score() on cleaned text, from precomputed term
+    # counts: only terms shared with the JD contribute to the dot product.
+    if resume_norm is None:
+        resume_norm = vector_norm(resume_counts)
+    if jd_norm is None:
+        jd_norm = vector_norm(jd_counts)
+    denom = resume_norm * jd_norm
+    semantic_score = 0
+    if denom != 0:
+        small, large = (jd_counts, resume_counts) if len(jd_counts) <= len(resume_counts) else (resume_counts, jd_counts)
+        semantic_score = sum(c * large.get(t, 0) for t, c in small.items()) / denom
+
+    return combine_ats_score(semantic_score * 100, resume_keywords, jd_keywords)
+
+
+STOPWORDS = frozenset([
+    "and","or","the","is","are","a","an","with","to","for","in","on","of","as","by",
+    "this","that","from","be","will","has","have","had","it","at"
+])
+
+
+def extract_keywords(text):
+    text = clean_text(text)
+    return keywords_from_tokens(text.split())
+
+
+def keywords_from_tokens(words):
+    # remove junk words
+    return set(w for w in words if len(w) > 2 and w not in STOPWORDS)
+
+
+def skill_match(resume_text, jd_text, resume_keys=None, jd_keys=None, resume_skills=None, jd_skills=None):
+    # Skills come from the taxonomy (multi-word phrases and synonyms, see
+    # skills.py). A JD that names nothing in the taxonomy, e.g. a non-tech
+    # role, falls back to plain keyword overlap.
+    if jd_skills is None:
+        jd_skills = get_skill_matcher().find(jd_text)
+    if jd_skills:
+        if resume_skills is None:
+            resume_skills = get_skill_matcher().find(resume_text)
+        resume_keys, jd_keys = resume_skills, jd_skills
+    else:
+        if resume_keys is None:
+            resume_keys = extract_keywords(resume_text)
+        if jd_keys is None:
+            jd_keys = extract_keywords(jd_text)
 
     matched = resume_keys.intersection(jd_keys)
     total_required = len(jd_keys) if len(jd_keys) > 0 else 1
@@ -100,19 +147,34 @@ def skill_match(resume_text, jd_text):
     return matched, jd_keys, percentage
 
 
-def grammar_readability_suggestions(text):
-    doc = nlp(text)
-    long_sentences = [sent.text for sent in doc.sents if len(sent.text.split()) > 25]
+def section_score(section_text, jd_keywords, section_keywords=None):
+    if section_keywords is None:
+        section_keywords = extract_keywords(section_text)
+    if not jd_keywords:
+        return 0, "No job description keywords to compare."
+    match_count = len(section_keywords & jd_keywords)
+    percent = round((match_count / len(jd_keywords)) * 100, 2)
+    if percent >= 60:
+        feedback = "Strong alignment with job requirements."
+    elif percent >= 30:
+        feedback = "Moderate alignment. Consider adding more relevant keywords."
+    else:
+        feedback = "Low alignment. Add more relevant skills/projects matching the JD."
+    return percent, feedback
+
 
-    suggestions = []
-    if long_sentences:
-        suggestions.append("Your resume has very long sentences. Try breaking them into shorter ones.")
+def extract_section(text, section_names):
+    sections = segment_sections(text)
+    for name in section_names:
+        section = sections.get(canonical_section(name))
+        if section:
+            return section_text(text, section)
+    return ""
 
-    passive_voice = [token.text for token in doc if token.dep_ == "auxpass"]
-    if passive_voice:
-        suggestions.append("Try to reduce passive voice. Use active voice to sound more confident.")
 
-    if not suggestions:
-        suggestions.append("Your resume readability looks good. Minor improvements can enhance clarity.")
+def grammar_readability_suggestions(text):
+    return get_analyzer().suggest(text)
+
 
-    return suggestions
+def grammar_readability_suggestions_many(texts, batch_size=32, n_process=1):
+    return list(get_analyzer().suggest_many(texts, batch_size=batch_size, n_process=n_process))
@@ -0,0 +1,65 @@
+from collections import namedtuple
+
+import numpy as np
+
+# A JD's keywords encoded once per query: ids (sorted uint32) of the ones
+# the vocabulary knows, how many there are in total (the denominator) and
+# the ones it has never seen, which are missing from every document
+KeywordQuery = namedtuple("KeywordQuery", ["ids", "total", "unseen"])
+
+
+# -------------------------
+# Pairwise helpers (sorted id arrays)
+# -------------------------
+def overlap_ids(a, b):
+    return np.intersect1d(a, b, assume_unique=True)
+
+
+def missing_ids(required, present):
+    return np.setdiff1d(required, present, assume_unique=True)
+
+
+def match_percent(resume_ids, jd_ids, total_required=None):
+    # Keyword overlap as in AnalysisResult.keyword_overlap_percent (the
+    # keyword term of ats_score): matched / required, 0 when the JD is empty
+    total_required = total_required or len(jd_ids) or 1
+    return round(len(overlap_ids(resume_ids, jd_ids)) / total_required * 100, 2)
+
+
+# -------------------------
+# Corpus of keyword sets
+# -------------------------
+class KeywordCorpus:
+    # Keyword sets for many documents held CSR-style: document i is the
+    # sorted, de-duplicated id array indices[indptr[i]:indptr[i + 1]], e.g.
+    # the column ids of a ResumeStore row, so a memory-mapped matrix is
+    # wrapped without copying. vocab translates between terms and ids:
+    # vocab.term_ids(terms) -> {term: id}, vocab.terms(ids) -> {id: term}.
+    def __init__(self, indptr, indices, vocab):
+        self.indptr = indptr
+        self.indices = indices
+        self.vocab = vocab
+
+    def row_ids(self, row):
+        return self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+    def keywords(self, row):
+        return set(self.vocab.terms(self.row_ids(row)).values())
+
+    def encode_query(self, jd_keywords):
+        jd_keywords = set(jd_keywords)
+        found = self.vocab.term_ids(jd_keywords)
+        ids = np.unique(np.fromiter(found.values(), dtype=np.uint32, count=len(found)))
+        return KeywordQuery(ids, len(jd_keywords), jd_keywords - found.keys())
+
+    def match_percents(self, query, rows):
+        return np.array([match_percent(self.row_ids(r), query.ids, query.total) for r in rows], dtype=np.float64)
+
+    def missing(self, query, rows):
+        # Missing JD keywords for each row, decoded with one vocabulary lookup
+        gaps = [missing_ids(query.ids, self.row_ids(r)) for r in rows]
+        names = self.vocab.terms(np.unique(np.concatenate(gaps))) if gaps else {}
+        return [{names[i] for i in gap.tolist()} | query.unseen for gap in gaps]
+
+    def __len__(self):
+        return len(self.indptr) - 1